@@ -1,8 +1,14 @@
-from fastapi import Header
+import hashlib
+from datetime import date, datetime, timezone
+from typing import Callable
+
+from fastapi import Depends, Header, HTTPException, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.session import get_db as _get_db
+from app.models.user import User
 
 
 def get_db() -> Session:
@@ -15,3 +21,103 @@ def get_request_user_id(x_user_id: str | None = Header(default=None)) -> str:
     Return the requester user ID, falling back to the default demo user.
     """
     return x_user_id or settings.default_user_id
+
+
+def cache_control(directive: str) -> Callable[[Response], None]:
+    """
+    Build a dependency that sets ``Cache-Control`` on the response.
+
+    Responses depend on the ``X-User-Id`` header, so shared caches must key on
+    it; ``Vary: Accept-Encoding`` is added by the compression middleware.
+    """
+
+    def set_headers(response: Response) -> None:
+        response.headers["Cache-Control"] = directive
+        response.headers["Vary"] = "X-User-Id"
+
+    return set_headers
+
+
+def versioned_cache_control(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+) -> None:
+    """
+    Mark a live per-user view revalidate-only and validate it with an ETag.
+
+    Every write that changes these views bumps ``User.sync_version``, so the
+    version plus the URL identifies the response. When ``If-None-Match``
+    carries the current tag the request ends here with a 304, before the
+    endpoint runs its queries.
+    """
+    headers = {"Cache-Control": CACHE_PRIVATE_REVALIDATE, "Vary": "X-User-Id"}
+    response.headers.update(headers)
+    version = db.scalar(select(User.sync_version).where(User.id == user_id))
+    if version is None:
+        # Let the endpoint answer for unknown users.
+        return
+    etag = _version_etag(request, user_id, version)
+    response.headers["ETag"] = etag
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        raise HTTPException(status_code=304, headers={**headers, "ETag": etag})
+
+
+def range_cache_control(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+) -> None:
+    """
+    Allow short client-side reuse only for ranges that end before today.
+
+    Ranges that include today change with the user's next write, so they are
+    revalidated like any other live view.
+    """
+    try:
+        end_date = date.fromisoformat(request.query_params.get("end_date", ""))
+    except ValueError:
+        end_date = None
+    if end_date is None or end_date >= date.today():
+        versioned_cache_control(request, response, db, user_id)
+        return
+    response.headers["Cache-Control"] = CACHE_PRIVATE_SHORT
+    response.headers["Vary"] = "X-User-Id"
+
+
+def _version_etag(request: Request, user_id: str, version: int) -> str:
+    # Views such as today's summary and goal periods also roll over at
+    # midnight (local and UTC) without any write.
+    key = "\n".join(
+        (
+            user_id,
+            str(version),
+            date.today().isoformat(),
+            datetime.now(timezone.utc).date().isoformat(),
+            request.url.path,
+            request.url.query,
+        )
+    )
+    # Weak: the compression middleware may re-encode the same representation.
+    return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` value against one ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+# Per-user reads: short client-side reuse, never stored by shared caches.
+CACHE_PRIVATE_SHORT = f"private, max-age={settings.dashboard_cache_max_age_seconds}"
+# Per-user reads that must reflect the latest write on every request; clients
+# revalidate with the ETag set by versioned_cache_control.
+CACHE_PRIVATE_REVALIDATE = "private, no-cache"
+CACHE_NO_STORE = "no-store"
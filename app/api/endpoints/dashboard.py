@@ -1,18 +1,40 @@
 from datetime import date, timedelta
+from typing import Literal
 
+import numpy as np
+import pyarrow as pa
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import Date, DateTime, Float, cast, func, select, union_all
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_request_user_id
+from app.api.deps import (
+    get_db,
+    get_request_user_id,
+    range_cache_control,
+    versioned_cache_control,
+)
+from app.api.endpoints.goals import list_goal_progress
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.goals import utc_today
+from app.core.singleflight import SingleFlight
+from app.db import archive
+from app.models.daily_rollup import DailyRollup, TagDailyRollup
 from app.models.study_session import StudySession
 from app.models.tag import SessionTag, Tag
 from app.models.user import User
 from app.schemas.dashboard import (
     DailyPoint,
+    FocusCell,
+    FocusTrendPoint,
+    GoalProgressResponse,
     HeatmapCell,
     HeatmapResponse,
+    InsightsResponse,
+    SessionLengthBucket,
     StreakResponse,
+    TagSeries,
+    TagSeriesResponse,
     TodaySummaryResponse,
     TopTag,
     WeeklySummaryResponse,
@@ -20,8 +42,22 @@ from app.schemas.dashboard import (
 
 router = APIRouter()
 
+# user_id -> (sync_version, InsightsResponse); session writes and archival bump
+# the version.
+_insights_cache: LRUCache[str, tuple[int, InsightsResponse]] = LRUCache(
+    settings.insights_cache_max_users
+)
+LENGTH_BUCKET_EDGES = [0, 15, 30, 45, 60, 90, 120, 180]
+# Identical concurrent range queries (multi-device opens, client retries)
+# share one in-flight aggregate per worker.
+dashboard_flight = SingleFlight("dashboard")
+# Views that must reflect the user's latest write; range views that end before
+# today may be reused briefly by the client.
+revalidate = [Depends(versioned_cache_control)]
+by_range = [Depends(range_cache_control)]
+
 
-@router.get("/today", response_model=TodaySummaryResponse)
+@router.get("/today", response_model=TodaySummaryResponse, dependencies=revalidate)
 def get_today_summary(
     target_date: date | None = Query(default=None, alias="date"),
     db: Session = Depends(get_db),
@@ -80,7 +116,7 @@ def get_today_summary(
     )
 
 
-@router.get("/weekly", response_model=WeeklySummaryResponse)
+@router.get("/weekly", response_model=WeeklySummaryResponse, dependencies=revalidate)
 def get_weekly_summary(
     end_date: date | None = Query(default=None),
     db: Session = Depends(get_db),
@@ -89,36 +125,19 @@ def get_weekly_summary(
     """Return rolling 7-day study metrics ending with provided date."""
     end = end_date or date.today()
     start = end - timedelta(days=6)
-    day_expr = func.date(StudySession.start_time)
-    stmt = (
-        select(
-            day_expr.label("day"),
-            func.coalesce(func.sum(StudySession.duration_minutes), 0),
-            func.avg(StudySession.focus_level),
-            func.count(StudySession.id),
-        )
-        .where(
-            StudySession.user_id == user_id,
-            day_expr >= start,
-            day_expr <= end,
-        )
-        .group_by("day")
-    )
-    rows = db.execute(stmt).all()
-    aggregates = {row.day: row for row in rows}
+    aggregates = {row.day: row for row in _daily_totals(db, user_id, start, end)}
 
     days: list[DailyPoint] = []
     current = start
     while current <= end:
         if current in aggregates:
             row = aggregates[current]
-            avg_focus = float(row[2]) if row[2] is not None else None
             days.append(
                 DailyPoint(
                     date=current,
-                    total_minutes=int(row[1]),
-                    avg_focus=avg_focus,
-                    session_count=int(row[3]),
+                    total_minutes=int(row.total_minutes),
+                    avg_focus=float(row.focus_sum) / int(row.session_count),
+                    session_count=int(row.session_count),
                 )
             )
         else:
@@ -135,7 +154,7 @@ def get_weekly_summary(
     return WeeklySummaryResponse(start_date=start, end_date=end, days=days)
 
 
-@router.get("/heatmap", response_model=HeatmapResponse)
+@router.get("/heatmap", response_model=HeatmapResponse, dependencies=by_range)
 def get_heatmap(
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -146,21 +165,8 @@ def get_heatmap(
     if end_date < start_date:
         raise HTTPException(status_code=400, detail="end_date must be after start_date")
 
-    day_expr = func.date(StudySession.start_time)
-    stmt = (
-        select(
-            day_expr.label("day"),
-            func.coalesce(func.sum(StudySession.duration_minutes), 0),
-        )
-        .where(
-            StudySession.user_id == user_id,
-            day_expr >= start_date,
-            day_expr <= end_date,
-        )
-        .group_by("day")
-    )
-    rows = db.execute(stmt).all()
-    aggregates = {row.day: int(row[1]) for row in rows}
+    rows = _daily_totals(db, user_id, start_date, end_date)
+    aggregates = {row.day: int(row.total_minutes) for row in rows}
 
     cells: list[HeatmapCell] = []
     current = start_date
@@ -173,7 +179,7 @@ def get_heatmap(
     return HeatmapResponse(start_date=start_date, end_date=end_date, cells=cells)
 
 
-@router.get("/streak", response_model=StreakResponse)
+@router.get("/streak", response_model=StreakResponse, dependencies=revalidate)
 def get_streak(
     db: Session = Depends(get_db),
     user_id: str = Depends(get_request_user_id),
@@ -187,3 +193,286 @@ def get_streak(
         longest_streak=user.longest_streak,
         last_study_date=user.last_study_date,
     )
+
+
+@router.get("/goals", response_model=GoalProgressResponse, dependencies=revalidate)
+def get_goal_progress(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Return progress toward each goal for the current UTC day and week."""
+    return GoalProgressResponse(date=utc_today(), goals=list_goal_progress(db, user_id))
+
+
+@router.get("/insights", response_model=InsightsResponse, dependencies=revalidate)
+def get_insights(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Return focus by weekday and hour (UTC), weekly focus trend and session lengths."""
+    user = db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    cached = _insights_cache.get(user_id)
+    if cached is not None and cached[0] == user.sync_version:
+        return cached[1]
+    version = user.sync_version
+
+    # One row of three arrays is far cheaper to fetch than one row per session.
+    stmt = select(
+        func.array_agg(StudySession.id),
+        func.array_agg(cast(func.extract("epoch", StudySession.start_time), Float)),
+        func.array_agg(StudySession.duration_minutes),
+        func.array_agg(StudySession.focus_level),
+    ).where(StudySession.user_id == user_id)
+    ids, epochs, minutes, focus = db.execute(stmt).one()
+    # Whole history: sessions moved to cold storage count too, once each.
+    archived = archive.read_table(
+        user_id,
+        columns=["start_time", "duration_minutes", "focus_level"],
+        exclude_ids=ids or (),
+    )
+    insights = _compute_insights(
+        np.concatenate(
+            [
+                np.asarray(epochs or [], dtype=np.float64),
+                # Archive timestamps are microseconds since the epoch.
+                archived["start_time"].cast(pa.int64()).to_numpy() / 1e6,
+            ]
+        ),
+        np.concatenate(
+            [
+                np.asarray(minutes or [], dtype=np.float64),
+                archived["duration_minutes"].to_numpy(),
+            ]
+        ),
+        np.concatenate(
+            [
+                np.asarray(focus or [], dtype=np.float64),
+                archived["focus_level"].to_numpy(),
+            ]
+        ),
+    )
+    _insights_cache.set(user_id, (version, insights))
+    return insights
+
+
+@router.get("/tags", response_model=TagSeriesResponse, dependencies=by_range)
+def get_tag_series(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    granularity: Literal["day", "week", "month"] = Query(default="day"),
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Return per-tag minutes for a period as totals and zero-filled series."""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+
+    bucket_expr = cast(func.date_trunc(granularity, StudySession.start_time), Date)
+    hot = (
+        select(
+            SessionTag.tag_id,
+            bucket_expr.label("bucket"),
+            func.sum(StudySession.duration_minutes).label("minutes"),
+        )
+        .join(StudySession, SessionTag.session_id == StudySession.id)
+        .where(
+            StudySession.user_id == user_id,
+            # Compare start_time directly so ix_study_sessions_user_start applies.
+            StudySession.start_time >= start_date,
+            StudySession.start_time < end_date + timedelta(days=1),
+        )
+        .group_by(SessionTag.tag_id, bucket_expr)
+    )
+    # Archived days come from tag_daily_rollups, as in _daily_totals_stmt.
+    rollup_bucket = cast(
+        func.date_trunc(granularity, cast(TagDailyRollup.day, DateTime)), Date
+    )
+    archived = (
+        select(
+            TagDailyRollup.tag_id,
+            rollup_bucket.label("bucket"),
+            func.sum(TagDailyRollup.total_minutes).label("minutes"),
+        )
+        .where(
+            TagDailyRollup.user_id == user_id,
+            TagDailyRollup.day >= start_date,
+            TagDailyRollup.day <= end_date,
+        )
+        .group_by(TagDailyRollup.tag_id, rollup_bucket)
+    )
+    combined = union_all(hot, archived).subquery()
+    per_bucket = (
+        select(
+            combined.c.tag_id,
+            combined.c.bucket,
+            func.sum(combined.c.minutes).label("minutes"),
+        )
+        .group_by(combined.c.tag_id, combined.c.bucket)
+        .subquery()
+    )
+    # Fold each tag's buckets into two arrays so only one row per tag crosses
+    # the wire.
+    stmt = (
+        select(
+            Tag.name,
+            func.array_agg(per_bucket.c.bucket).label("buckets"),
+            func.array_agg(per_bucket.c.minutes).label("minutes"),
+        )
+        .join(per_bucket, per_bucket.c.tag_id == Tag.id)
+        .where(Tag.user_id == user_id)
+        .group_by(Tag.id, Tag.name)
+    )
+
+    buckets = _series_buckets(start_date, end_date, granularity)
+    position = {bucket: idx for idx, bucket in enumerate(buckets)}
+    series: list[TagSeries] = []
+    for row in db.execute(stmt):
+        minutes = [0] * len(buckets)
+        for bucket, value in zip(row.buckets, row.minutes):
+            minutes[position[bucket]] = int(value)
+        series.append(
+            TagSeries(name=row.name, total_minutes=sum(minutes), minutes=minutes)
+        )
+    series.sort(key=lambda item: (-item.total_minutes, item.name))
+    return TagSeriesResponse(
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+        buckets=buckets,
+        tags=series,
+    )
+
+
+def _series_buckets(start: date, end: date, granularity: str) -> list[date]:
+    """Return bucket start dates matching Postgres date_trunc for the range."""
+    if granularity == "week":
+        current = start - timedelta(days=start.weekday())
+    elif granularity == "month":
+        current = start.replace(day=1)
+    else:
+        current = start
+
+    buckets: list[date] = []
+    while current <= end:
+        buckets.append(current)
+        if granularity == "day":
+            current += timedelta(days=1)
+        elif granularity == "week":
+            current += timedelta(weeks=1)
+        else:
+            current = (current + timedelta(days=32)).replace(day=1)
+    return buckets
+
+
+def _compute_insights(
+    epochs: np.ndarray, minutes: np.ndarray, focus: np.ndarray
+) -> InsightsResponse:
+    """Aggregate session arrays into insight buckets with vectorized group sums."""
+    seconds = epochs.astype(np.int64)
+    days = seconds // 86_400
+    # 1970-01-01 was a Thursday; shift so Monday is weekday 0.
+    weekday = (days + 3) % 7
+    hour = (seconds - days * 86_400) // 3_600
+
+    cell = weekday * 24 + hour
+    cell_counts = np.bincount(cell, minlength=7 * 24)
+    cell_minutes = np.bincount(cell, weights=minutes, minlength=7 * 24)
+    cell_focus = np.bincount(cell, weights=focus, minlength=7 * 24)
+    weekday_hour = [
+        FocusCell(
+            weekday=int(idx // 24),
+            hour=int(idx % 24),
+            avg_focus=round(float(cell_focus[idx] / cell_counts[idx]), 2),
+            total_minutes=int(cell_minutes[idx]),
+            session_count=int(cell_counts[idx]),
+        )
+        for idx in np.flatnonzero(cell_counts)
+    ]
+
+    weeks = (days + 3) // 7
+    first_week = int(weeks.min()) if len(weeks) else 0
+    week_codes = weeks - first_week
+    week_counts = np.bincount(week_codes)
+    week_minutes = np.bincount(week_codes, weights=minutes)
+    week_focus = np.bincount(week_codes, weights=focus)
+    epoch_monday = date(1970, 1, 1) - timedelta(days=3)
+    focus_trend = [
+        FocusTrendPoint(
+            week_start=epoch_monday + timedelta(weeks=first_week + int(i)),
+            avg_focus=round(float(week_focus[i] / week_counts[i]), 2),
+            total_minutes=int(week_minutes[i]),
+            session_count=int(week_counts[i]),
+        )
+        for i in np.flatnonzero(week_counts)
+    ]
+
+    edges = np.asarray(LENGTH_BUCKET_EDGES)
+    bucket = np.searchsorted(edges, minutes, side="right") - 1
+    bucket_counts = np.bincount(bucket, minlength=len(edges))
+    length_distribution = [
+        SessionLengthBucket(
+            min_minutes=int(edges[i]),
+            max_minutes=int(edges[i + 1]) if i + 1 < len(edges) else None,
+            session_count=int(bucket_counts[i]),
+        )
+        for i in range(len(edges))
+    ]
+
+    return InsightsResponse(
+        session_count=int(len(epochs)),
+        weekday_hour=weekday_hour,
+        focus_trend=focus_trend,
+        length_distribution=length_distribution,
+    )
+
+
+def _daily_totals(db: Session, user_id: str, start: date, end: date) -> list:
+    """Run the daily totals query, sharing it with identical in-flight requests."""
+    return dashboard_flight.do(
+        ("daily_totals", user_id, start, end),
+        lambda: db.execute(_daily_totals_stmt(user_id, start, end)).all(),
+    )
+
+
+def _daily_totals_stmt(user_id: str, start: date, end: date):
+    """
+    Per-day minutes, focus sum and session count across hot and archived data.
+
+    Days moved to cold storage are served from ``daily_rollups``; a day can
+    appear in both when a session is backdated into an archived range.
+    """
+    day_expr = func.date(StudySession.start_time)
+    hot = (
+        select(
+            day_expr.label("day"),
+            func.sum(StudySession.duration_minutes).label("total_minutes"),
+            func.sum(StudySession.focus_level).label("focus_sum"),
+            func.count(StudySession.id).label("session_count"),
+        )
+        .where(
+            StudySession.user_id == user_id,
+            day_expr >= start,
+            day_expr <= end,
+        )
+        .group_by(day_expr)
+    )
+    archived = select(
+        DailyRollup.day,
+        DailyRollup.total_minutes,
+        DailyRollup.focus_sum,
+        DailyRollup.session_count,
+    ).where(
+        DailyRollup.user_id == user_id,
+        DailyRollup.day >= start,
+        DailyRollup.day <= end,
+    )
+    combined = union_all(hot, archived).subquery()
+    return select(
+        combined.c.day,
+        func.sum(combined.c.total_minutes).label("total_minutes"),
+        func.sum(combined.c.focus_sum).label("focus_sum"),
+        func.sum(combined.c.session_count).label("session_count"),
+    ).group_by(combined.c.day)
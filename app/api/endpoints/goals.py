@@ -0,0 +1,173 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import (
+    CACHE_NO_STORE,
+    cache_control,
+    get_db,
+    get_request_user_id,
+    versioned_cache_control,
+)
+from app.api.endpoints.sessions import (
+    _get_or_create_tags,
+    _lock_user,
+    _next_sync_version,
+    _publish_tag_changes,
+    _run_user_write,
+)
+from app.core.goals import (
+    current_progress,
+    period_end,
+    period_minutes,
+    period_start,
+    utc_today,
+)
+from app.models.goal import Goal
+from app.schemas.goal import GoalCreate, GoalListResponse, GoalPublic, GoalUpdate
+
+router = APIRouter()
+
+no_store = [Depends(cache_control(CACHE_NO_STORE))]
+
+
+@router.get(
+    "",
+    response_model=GoalListResponse,
+    dependencies=[Depends(versioned_cache_control)],
+)
+def list_goals(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Return the user's goals with progress for their current period."""
+    return GoalListResponse(items=list_goal_progress(db, user_id))
+
+
+@router.post("", response_model=GoalPublic, status_code=201, dependencies=no_store)
+def create_goal(
+    payload: GoalCreate,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Create a goal and seed its progress from the current period's sessions."""
+
+    def write() -> Goal:
+        if not _lock_user(db, user_id):
+            raise HTTPException(status_code=404, detail="User not found")
+        goal = Goal(user_id=user_id)
+        resolved = _apply_goal_payload(db, user_id, goal, payload)
+        db.add(goal)
+        db.commit()
+        _publish_tag_changes(user_id, resolved)
+        return goal
+
+    goal = _run_user_write(db, write)
+    db.refresh(goal)
+    return _build_goal_public(goal)
+
+
+@router.put("/{goal_id}", response_model=GoalPublic, dependencies=no_store)
+def update_goal(
+    goal_id: int,
+    payload: GoalUpdate,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Replace a goal's definition and recount its current period."""
+
+    def write() -> Goal:
+        _lock_user(db, user_id)
+        goal = _get_goal_or_404(db, goal_id, user_id)
+        resolved = _apply_goal_payload(db, user_id, goal, payload)
+        db.commit()
+        _publish_tag_changes(user_id, resolved)
+        return goal
+
+    goal = _run_user_write(db, write)
+    db.refresh(goal)
+    return _build_goal_public(goal)
+
+
+@router.delete(
+    "/{goal_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=no_store
+)
+def delete_goal(
+    goal_id: int,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Remove a goal."""
+
+    def write() -> None:
+        _lock_user(db, user_id)
+        goal = _get_goal_or_404(db, goal_id, user_id)
+        db.delete(goal)
+        # Goal views are revalidated against the user's sync version.
+        _next_sync_version(db, user_id)
+        db.commit()
+
+    _run_user_write(db, write)
+
+
+def list_goal_progress(db: Session, user_id: str) -> list[GoalPublic]:
+    """Read every goal's stored counter; no session rows are scanned."""
+    goals = (
+        db.scalars(
+            select(Goal).where(Goal.user_id == user_id).order_by(Goal.id.asc())
+        )
+        .unique()
+        .all()
+    )
+    today = utc_today()
+    return [_build_goal_public(goal, today) for goal in goals]
+
+
+def _apply_goal_payload(
+    db: Session, user_id: str, goal: Goal, payload: GoalCreate
+) -> dict[str, int]:
+    """
+    Copy the payload onto the goal and recount the current period.
+
+    The caller holds the user row lock, so no session write can land between
+    the recount and the commit. The user's sync version is bumped so cached
+    goal views revalidate. Returns newly resolved tag IDs for publishing.
+    """
+    resolved: dict[str, int] = {}
+    tag_id = None
+    version = _next_sync_version(db, user_id)
+    if payload.tag and payload.tag.strip():
+        resolved = _get_or_create_tags(db, user_id, [payload.tag], version)
+        tag_id = next(iter(resolved.values()))
+
+    start = period_start(payload.period, utc_today())
+    goal.period = payload.period
+    goal.target_minutes = payload.target_minutes
+    goal.tag_id = tag_id
+    goal.period_start = start
+    goal.progress_minutes = period_minutes(db, user_id, payload.period, start, tag_id)
+    return resolved
+
+
+def _get_goal_or_404(db: Session, goal_id: int, user_id: str) -> Goal:
+    goal = db.get(Goal, goal_id)
+    if not goal or goal.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    return goal
+
+
+def _build_goal_public(goal: Goal, today: date | None = None) -> GoalPublic:
+    """Serialize a Goal, reading a lapsed period as a fresh one with no progress."""
+    start, progress = current_progress(goal, today)
+    return GoalPublic(
+        id=goal.id,
+        period=goal.period,
+        target_minutes=goal.target_minutes,
+        tag=goal.tag.name if goal.tag else None,
+        period_start=start,
+        period_end=period_end(goal.period, start),
+        progress_minutes=progress,
+        completed=progress >= goal.target_minutes,
+    )
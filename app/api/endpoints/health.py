@@ -1,21 +1,52 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Response, status
 
-from app.api.deps import get_db
-from app.schemas.system import HealthResponse
+from app.core.singleflight import all_stats
+from app.db.session import db_monitor
+from app.schemas.system import (
+    HealthResponse,
+    LivenessResponse,
+    MetricsResponse,
+    ReadinessResponse,
+    SingleFlightStats,
+)
 
 router = APIRouter()
 
 
 @router.get("", response_model=HealthResponse)
-def health_check(db: Session = Depends(get_db)):
-    """Return API and database availability."""
-    db_status = "ok"
-    try:
-        db.execute(text("SELECT 1"))
-    except Exception:
-        db_status = "error"
+def health_check():
+    """Return API and database availability from the cached DB check."""
+    db_status = "ok" if db_monitor.status.ok else "error"
     return HealthResponse(status="ok", db=db_status, time=datetime.now(timezone.utc))
+
+
+@router.get("/live", response_model=LivenessResponse)
+def liveness():
+    """Report that the process is up; never touches the database."""
+    return LivenessResponse(status="ok", time=datetime.now(timezone.utc))
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+def readiness(response: Response):
+    """Report whether this worker should receive traffic (503 when not)."""
+    db_status = db_monitor.status
+    ready = db_monitor.is_ready()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(
+        status="ok" if ready else "unavailable",
+        db="ok" if db_status.ok else "error",
+        checked_at=db_status.checked_at,
+        latency_ms=db_status.latency_ms,
+        pool=db_status.pool,
+    )
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+def metrics():
+    """Return in-process counters for this worker."""
+    return MetricsResponse(
+        singleflight=[SingleFlightStats(**stats) for stats in all_stats()]
+    )
@@ -1,12 +1,29 @@
-from datetime import date
+from datetime import date, datetime, timezone
+from typing import Callable, Iterable, TypeVar
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select, union, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_request_user_id
+from app.api.deps import (
+    CACHE_NO_STORE,
+    cache_control,
+    get_db,
+    get_request_user_id,
+    versioned_cache_control,
+)
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.goals import record_goal_progress, session_day, utc_today
+from app.core.tag_index import tag_index
+from app.db import archive
+from app.db.session import is_retryable, run_with_retry
+from app.models.daily_rollup import DailyRollup
 from app.models.study_session import StudySession
-from app.models.tag import Tag
+from app.models.sync_tombstone import SyncTombstone
+from app.models.tag import SessionTag, Tag
 from app.models.user import User
 from app.schemas.session import (
     SessionCreate,
@@ -18,43 +35,50 @@ from app.schemas.session import (
 
 router = APIRouter()
 
+T = TypeVar("T")
+
+no_store = [Depends(cache_control(CACHE_NO_STORE))]
+revalidate = [Depends(versioned_cache_control)]
+
+# user_id -> {tag name: tag id}; only IDs from committed transactions go in.
+_tag_id_cache: LRUCache[str, dict[str, int]] = LRUCache(settings.tag_index_max_users)
 
-@router.post("", response_model=SessionDetail, status_code=201)
+
+@router.post("", response_model=SessionDetail, status_code=201, dependencies=no_store)
 def create_session(
     payload: SessionCreate,
     db: Session = Depends(get_db),
     user_id: str = Depends(get_request_user_id),
 ):
     """Create a study session entry with tag handling and streak updates."""
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    duration_minutes = int(
-        (payload.end_time - payload.start_time).total_seconds() // 60
-    )
-    if duration_minutes <= 0:
-        raise HTTPException(status_code=400, detail="duration_minutes must be positive")
-
-    session = StudySession(
-        user_id=user_id,
-        start_time=payload.start_time,
-        end_time=payload.end_time,
-        duration_minutes=duration_minutes,
-        focus_level=payload.focus_level,
-        memo=payload.memo,
-    )
-    session.tags = _get_or_create_tags(db, user_id, payload.tags)
-
-    db.add(session)
-    db.flush()
-    _refresh_user_streaks(db, user)
-    db.commit()
+    error = _session_time_error(payload)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    def write() -> StudySession:
+        user = _lock_user(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        version = _next_sync_version(db, user_id)
+        tag_ids = _get_or_create_tags(db, user_id, payload.tags, version)
+        session = _new_session(db, user_id, payload, tag_ids, version)
+        record_goal_progress(
+            db,
+            user_id,
+            [(session.start_time, session.duration_minutes, tag_ids.values())],
+        )
+        _refresh_user_streaks(db, user)
+        db.commit()
+        _publish_tag_changes(user_id, tag_ids, version, used=_tag_refs(tag_ids))
+        return session
+
+    session = _run_user_write(db, write)
     db.refresh(session)
     return _build_session_detail(session)
 
 
-@router.get("/recent", response_model=SessionListResponse)
+@router.get("/recent", response_model=SessionListResponse, dependencies=revalidate)
 def list_recent_sessions(
     limit: int = Query(default=10, ge=1, le=50),
     db: Session = Depends(get_db),
@@ -72,7 +96,38 @@ def list_recent_sessions(
     return SessionListResponse(items=items)
 
 
-@router.get("/{session_id}", response_model=SessionDetail)
+@router.get("/history", response_model=SessionListResponse, dependencies=revalidate)
+def list_session_history(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Return sessions in a date range, including ones moved to cold storage."""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+
+    day_expr = func.date(StudySession.start_time)
+    stmt = select(StudySession).where(
+        StudySession.user_id == user_id,
+        day_expr >= start_date,
+        day_expr <= end_date,
+    )
+    sessions = db.scalars(stmt).unique().all()
+    items = [_build_session_public(s) for s in sessions]
+    # The archive holds whatever the archival job has moved so far, whatever
+    # horizon it ran with; only the years the range touches are opened.
+    items.extend(
+        SessionPublic(**row)
+        for row in archive.read_sessions(
+            user_id, start_date, end_date, exclude_ids=[s.id for s in sessions]
+        )
+    )
+    items.sort(key=lambda item: item.start_time, reverse=True)
+    return SessionListResponse(items=items)
+
+
+@router.get("/{session_id}", response_model=SessionDetail, dependencies=revalidate)
 def get_session(
     session_id: int,
     db: Session = Depends(get_db),
@@ -83,7 +138,7 @@ def get_session(
     return _build_session_detail(session)
 
 
-@router.put("/{session_id}", response_model=SessionDetail)
+@router.put("/{session_id}", response_model=SessionDetail, dependencies=no_store)
 def update_session(
     session_id: int,
     payload: SessionUpdate,
@@ -91,63 +146,299 @@ def update_session(
     user_id: str = Depends(get_request_user_id),
 ):
     """Update every field of the given study session."""
-    session = _get_session_or_404(db, session_id, user_id)
-
-    duration_minutes = int(
-        (payload.end_time - payload.start_time).total_seconds() // 60
-    )
-    if duration_minutes <= 0:
-        raise HTTPException(status_code=400, detail="duration_minutes must be positive")
-
-    session.start_time = payload.start_time
-    session.end_time = payload.end_time
-    session.duration_minutes = duration_minutes
-    session.focus_level = payload.focus_level
-    session.memo = payload.memo
-    session.tags = _get_or_create_tags(db, user_id, payload.tags)
+    error = _session_time_error(payload)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    duration_minutes = _duration_minutes(payload)
+
+    def write() -> StudySession:
+        user = _lock_user(db, user_id)
+        session = _get_session_or_404(db, session_id, user_id)
+        # Goals lose the old version of the session and gain the new one.
+        replaced = (
+            session.start_time,
+            -session.duration_minutes,
+            [tag.id for tag in session.tags],
+        )
+        session.start_time = payload.start_time
+        session.end_time = payload.end_time
+        session.duration_minutes = duration_minutes
+        session.focus_level = payload.focus_level
+        session.memo = payload.memo
+        version = _next_sync_version(db, user_id)
+        session.sync_version = version
+        old_ids = {tag.name: tag.id for tag in session.tags}
+        new_ids = _get_or_create_tags(db, user_id, payload.tags, version)
+        added = {name: tag_id for name, tag_id in new_ids.items() if name not in old_ids}
+        removed = {name: tag_id for name, tag_id in old_ids.items() if name not in new_ids}
+        _set_session_tags(db, session.id, added.values(), removed.values())
+        _adjust_tag_usage(db, added.values(), 1)
+        _adjust_tag_usage(db, removed.values(), -1)
+        record_goal_progress(
+            db,
+            user_id,
+            [replaced, (payload.start_time, duration_minutes, new_ids.values())],
+        )
 
-    db.flush()
-    _refresh_user_streaks(db, session.user)
-    db.commit()
+        db.flush()
+        _refresh_user_streaks(db, user)
+        db.commit()
+        _publish_tag_changes(
+            user_id,
+            new_ids,
+            version,
+            used=_tag_refs(added),
+            released=_tag_refs(removed),
+        )
+        return session
+
+    session = _run_user_write(db, write)
     db.refresh(session)
     return _build_session_detail(session)
 
 
-@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{session_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=no_store
+)
 def delete_session(
     session_id: int,
     db: Session = Depends(get_db),
     user_id: str = Depends(get_request_user_id),
 ):
     """Remove a study session and recalculate streak metadata."""
-    session = _get_session_or_404(db, session_id, user_id)
-    user = session.user
-    db.delete(session)
+
+    def write() -> None:
+        user = _lock_user(db, user_id)
+        session = _get_session_or_404(db, session_id, user_id)
+        version = _next_sync_version(db, user_id)
+        db.add(
+            SyncTombstone(
+                user_id=user_id,
+                entity="session",
+                entity_id=session.id,
+                sync_version=version,
+            )
+        )
+        released = {tag.name: tag.id for tag in session.tags}
+        _adjust_tag_usage(db, released.values(), -1)
+        record_goal_progress(
+            db,
+            user_id,
+            [(session.start_time, -session.duration_minutes, released.values())],
+        )
+        db.delete(session)
+        db.flush()
+        _refresh_user_streaks(db, user)
+        db.commit()
+        _publish_tag_changes(user_id, {}, version, released=_tag_refs(released))
+
+    _run_user_write(db, write)
+
+
+def _lock_user(db: Session, user_id: str) -> User | None:
+    """
+    Lock the user row for the rest of the transaction and return it fresh.
+
+    Every session write for a user takes this lock first, so streaks are
+    computed from committed data and written back without lost updates.
+    Writers for different users never contend. The wait is bounded by
+    ``lock_timeout``; a timeout surfaces as a retryable error.
+    """
+    db.execute(
+        select(func.set_config("lock_timeout", f"{settings.db_lock_timeout_ms}ms", True))
+    )
+    stmt = (
+        select(User)
+        .where(User.id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return db.scalars(stmt).one_or_none()
+
+
+def _run_user_write(db: Session, write: Callable[[], T]) -> T:
+    """Run a locked per-user write, retrying transient lock conflicts."""
+    try:
+        return run_with_retry(db, write)
+    except DBAPIError as exc:
+        if is_retryable(exc):
+            raise HTTPException(
+                status_code=503, detail="Too many concurrent writes, please retry"
+            ) from exc
+        raise
+
+
+def _next_sync_version(db: Session, user_id: str) -> int:
+    """Atomically bump and return the user's change counter.
+
+    The UPDATE holds the user row lock until commit, so versions become
+    visible to ``/sync/changes`` in the order they were handed out.
+    """
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(sync_version=User.sync_version + 1)
+        .returning(User.sync_version)
+    )
+    return db.execute(stmt).scalar_one()
+
+
+def _new_session(
+    db: Session,
+    user_id: str,
+    payload: SessionCreate,
+    tag_ids: dict[str, int],
+    version: int,
+    client_id: str | None = None,
+) -> StudySession:
+    """
+    Insert a StudySession from a creation payload and link its tags.
+
+    The payload must already have passed ``_session_time_error``.
+    """
+    session = StudySession(
+        user_id=user_id,
+        start_time=payload.start_time,
+        end_time=payload.end_time,
+        duration_minutes=_duration_minutes(payload),
+        focus_level=payload.focus_level,
+        memo=payload.memo,
+        client_id=client_id,
+        sync_version=version,
+    )
+    db.add(session)
     db.flush()
-    _refresh_user_streaks(db, user)
-    db.commit()
+    _set_session_tags(db, session.id, tag_ids.values(), ())
+    _adjust_tag_usage(db, tag_ids.values(), 1)
+    return session
+
 
+def _duration_minutes(payload: SessionCreate) -> int:
+    return int((payload.end_time - payload.start_time).total_seconds() // 60)
 
-def _get_or_create_tags(db: Session, user_id: int, names: list[str]) -> list[Tag]:
-    """Ensure tags exist for the provided names and return Tag objects."""
-    normalized = sorted({name.strip() for name in names if name.strip()})
+
+def _session_time_error(payload: SessionCreate) -> str | None:
+    """Return why a payload's times cannot be stored, or None if they can."""
+    if _duration_minutes(payload) <= 0:
+        return "duration_minutes must be positive"
+    # Goal counters only track the current period, so a session dated after
+    # it would never be counted once that period arrives.
+    if session_day(payload.start_time) > utc_today():
+        return "start_time must not be after today (UTC)"
+    return None
+
+
+def _normalize_tag_names(names: list[str]) -> list[str]:
+    return sorted({name.strip() for name in names if name.strip()})
+
+
+def _get_or_create_tags(
+    db: Session, user_id: str, names: list[str], sync_version: int
+) -> dict[str, int]:
+    """
+    Resolve tag names to IDs, creating missing tags, and return name -> id.
+
+    Cached names cost nothing. The rest go through one
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING``; names another writer
+    created concurrently come back empty from it and are read afterwards, so
+    racing on ``uq_user_tag`` never raises.
+    """
+    normalized = _normalize_tag_names(names)
     if not normalized:
-        return []
-
-    existing = db.scalars(
-        select(Tag).where(Tag.user_id == user_id, Tag.name.in_(normalized))
-    ).all()
-    existing_map = {tag.name: tag for tag in existing}
-    new_tags: list[Tag] = []
-    for name in normalized:
-        if name not in existing_map:
-            tag = Tag(user_id=user_id, name=name)
-            db.add(tag)
-            new_tags.append(tag)
-            existing_map[name] = tag
-    if new_tags:
-        db.flush()
-    return list(existing_map.values())
+        return {}
+
+    cached = _tag_id_cache.get(user_id) or {}
+    resolved = {name: cached[name] for name in normalized if name in cached}
+    missing = [name for name in normalized if name not in resolved]
+    if not missing:
+        return resolved
+
+    stmt = (
+        pg_insert(Tag)
+        .values(
+            [
+                {"user_id": user_id, "name": name, "sync_version": sync_version}
+                for name in missing
+            ]
+        )
+        .on_conflict_do_nothing(constraint="uq_user_tag")
+        .returning(Tag.id, Tag.name)
+    )
+    created = {row.name: row.id for row in db.execute(stmt)}
+    resolved.update(created)
+
+    existing = [name for name in missing if name not in created]
+    if existing:
+        rows = db.execute(
+            select(Tag.id, Tag.name).where(
+                Tag.user_id == user_id, Tag.name.in_(existing)
+            )
+        )
+        resolved.update({row.name: row.id for row in rows})
+    return resolved
+
+
+def _set_session_tags(
+    db: Session, session_id: int, add_ids: Iterable[int], remove_ids: Iterable[int]
+) -> None:
+    """Link and unlink tags via session_tags rows without loading Tag objects."""
+    add_ids, remove_ids = list(add_ids), list(remove_ids)
+    if remove_ids:
+        db.execute(
+            delete(SessionTag).where(
+                SessionTag.session_id == session_id,
+                SessionTag.tag_id.in_(remove_ids),
+            )
+        )
+    if add_ids:
+        db.execute(
+            insert(SessionTag),
+            [{"session_id": session_id, "tag_id": tag_id} for tag_id in add_ids],
+        )
+
+
+def _adjust_tag_usage(db: Session, tag_ids: Iterable[int], delta: int) -> None:
+    """Shift usage counters for the given tags without recounting session_tags."""
+    tag_ids = list(tag_ids)
+    if not tag_ids:
+        return
+    # Clamped like TagIndex.record_usage so the DB and the index never diverge.
+    values = {"usage_count": func.greatest(Tag.usage_count + delta, 0)}
+    if delta > 0:
+        values["last_used_at"] = func.now()
+    stmt = (
+        update(Tag)
+        .where(Tag.id.in_(tag_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(stmt)
+
+
+def _tag_refs(tag_ids: dict[str, int]) -> list[tuple[int, str]]:
+    return [(tag_id, name) for name, tag_id in tag_ids.items()]
+
+
+def _publish_tag_changes(
+    user_id: str,
+    resolved: dict[str, int],
+    version: int = 0,
+    used: list[tuple[int, str]] = (),
+    released: list[tuple[int, str]] = (),
+) -> None:
+    """
+    After commit, cache resolved tag IDs and patch the suggestion index.
+
+    ``version`` is the sync version the write committed under; the index uses
+    it to skip usage changes already contained in its last load.
+    """
+    if resolved:
+        cached = _tag_id_cache.get(user_id) or {}
+        _tag_id_cache.set(user_id, {**cached, **resolved})
+    if used:
+        tag_index.record_usage(user_id, used, 1, version, datetime.now(timezone.utc))
+    if released:
+        tag_index.record_usage(user_id, released, -1, version)
 
 
 def _get_session_or_404(db: Session, session_id: int, user_id: str) -> StudySession:
@@ -184,12 +475,11 @@ def _build_session_detail(session: StudySession) -> SessionDetail:
 def _refresh_user_streaks(db: Session, user: User) -> None:
     """Recalculate streak fields based on all sessions for the user."""
     day_expr = func.date(StudySession.start_time)
-    stmt = (
-        select(day_expr)
-        .where(StudySession.user_id == user.id)
-        .distinct()
-        .order_by(day_expr.desc())
-    )
+    days = union(
+        select(day_expr.label("day")).where(StudySession.user_id == user.id),
+        select(DailyRollup.day).where(DailyRollup.user_id == user.id),
+    ).subquery()
+    stmt = select(days.c.day).order_by(days.c.day.desc())
     days_desc = db.scalars(stmt).all()
     if not days_desc:
         user.last_study_date = None
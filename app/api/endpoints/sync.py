@@ -0,0 +1,195 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_request_user_id
+from app.api.endpoints.sessions import (
+    _build_session_detail,
+    _get_or_create_tags,
+    _lock_user,
+    _new_session,
+    _next_sync_version,
+    _normalize_tag_names,
+    _publish_tag_changes,
+    _refresh_user_streaks,
+    _run_user_write,
+    _session_time_error,
+    _tag_refs,
+)
+from app.core.goals import record_goal_progress
+from app.models.study_session import StudySession
+from app.models.sync_tombstone import SyncTombstone
+from app.models.tag import Tag
+from app.models.user import User
+from app.schemas.sync import (
+    SyncChangesResponse,
+    SyncPushRequest,
+    SyncPushResponse,
+    SyncRejectedItem,
+    SyncSessionItem,
+    SyncTagItem,
+    SyncTombstoneItem,
+)
+
+router = APIRouter()
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+def get_changes(
+    since: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Return sessions, tags and deletions recorded after the given token."""
+    user = db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Versions are handed out under the user row lock, so everything up to the
+    # committed counter is already visible and nothing above it is returned.
+    token = user.sync_version
+    if since >= token:
+        return SyncChangesResponse(token=token, sessions=[], tags=[], deleted=[])
+
+    session_stmt = (
+        select(StudySession)
+        .where(
+            StudySession.user_id == user_id,
+            StudySession.sync_version > since,
+            StudySession.sync_version <= token,
+        )
+        .order_by(StudySession.sync_version.asc())
+    )
+    sessions = db.scalars(session_stmt).unique().all()
+
+    tag_stmt = (
+        select(Tag)
+        .where(
+            Tag.user_id == user_id,
+            Tag.sync_version > since,
+            Tag.sync_version <= token,
+        )
+        .order_by(Tag.sync_version.asc())
+    )
+    tags = db.scalars(tag_stmt).all()
+
+    tombstone_stmt = (
+        select(SyncTombstone)
+        .where(
+            SyncTombstone.user_id == user_id,
+            SyncTombstone.sync_version > since,
+            SyncTombstone.sync_version <= token,
+        )
+        .order_by(SyncTombstone.sync_version.asc())
+    )
+    tombstones = db.scalars(tombstone_stmt).all()
+
+    return SyncChangesResponse(
+        token=token,
+        sessions=[_build_sync_session(s) for s in sessions],
+        tags=[
+            SyncTagItem(id=tag.id, name=tag.name, sync_version=tag.sync_version)
+            for tag in tags
+        ],
+        deleted=[
+            SyncTombstoneItem(
+                entity=t.entity, id=t.entity_id, sync_version=t.sync_version
+            )
+            for t in tombstones
+        ],
+    )
+
+
+@router.post("/sessions", response_model=SyncPushResponse)
+def push_sessions(
+    payload: SyncPushRequest,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """
+    Create offline-recorded sessions, skipping client IDs already stored.
+
+    Invalid items are reported under ``rejected`` instead of failing the
+    batch, so a client replaying its queue is never stuck on one bad entry.
+    """
+    client_ids = list(dict.fromkeys(item.client_id for item in payload.sessions))
+    # The first occurrence of a repeated client ID is the one stored.
+    first = {item.client_id: item for item in reversed(payload.sessions)}
+    errors = {
+        client_id: error
+        for client_id, item in first.items()
+        if (error := _session_time_error(item))
+    }
+
+    def write() -> dict[str, StudySession]:
+        # The user row lock serializes concurrent retries of the same batch, so
+        # they never race on uq_user_session_client.
+        user = _lock_user(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        existing_stmt = select(StudySession).where(
+            StudySession.user_id == user_id, StudySession.client_id.in_(client_ids)
+        )
+        by_client_id = {s.client_id: s for s in db.scalars(existing_stmt).unique()}
+        pending = {
+            client_id: item
+            for client_id, item in first.items()
+            if client_id not in by_client_id and client_id not in errors
+        }
+        if not pending:
+            db.rollback()
+            return by_client_id
+
+        version = _next_sync_version(db, user_id)
+        # Resolve every tag in the batch with one upsert.
+        tag_ids = _get_or_create_tags(
+            db,
+            user_id,
+            [name for item in pending.values() for name in item.tags],
+            version,
+        )
+        used_tags: list[tuple[int, str]] = []
+        goal_changes = []
+        for client_id in client_ids:
+            if client_id not in pending:
+                continue
+            item = pending[client_id]
+            item_tags = {name: tag_ids[name] for name in _normalize_tag_names(item.tags)}
+            by_client_id[client_id] = _new_session(
+                db, user_id, item, item_tags, version, client_id=client_id
+            )
+            used_tags.extend(_tag_refs(item_tags))
+            session = by_client_id[client_id]
+            goal_changes.append(
+                (session.start_time, session.duration_minutes, item_tags.values())
+            )
+        record_goal_progress(db, user_id, goal_changes)
+        _refresh_user_streaks(db, user)
+        db.commit()
+        _publish_tag_changes(user_id, tag_ids, version, used=used_tags)
+        return by_client_id
+
+    by_client_id = _run_user_write(db, write)
+    return SyncPushResponse(
+        items=[
+            _build_sync_session(by_client_id[cid])
+            for cid in client_ids
+            if cid in by_client_id
+        ],
+        rejected=[
+            SyncRejectedItem(client_id=cid, detail=errors[cid])
+            for cid in client_ids
+            if cid not in by_client_id
+        ],
+    )
+
+
+def _build_sync_session(session: StudySession) -> SyncSessionItem:
+    """Serialize a StudySession with its sync metadata."""
+    detail = _build_session_detail(session)
+    return SyncSessionItem(
+        **detail.model_dump(),
+        client_id=session.client_id,
+        sync_version=session.sync_version,
+    )
@@ -1,15 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_request_user_id
+from app.api.deps import (
+    CACHE_PRIVATE_SHORT,
+    cache_control,
+    get_db,
+    get_request_user_id,
+    versioned_cache_control,
+)
+from app.core.tag_index import tag_index
 from app.models.tag import Tag
-from app.schemas.tag import TagItem, TagListResponse
+from app.schemas.tag import TagItem, TagListResponse, TagSuggestion, TagSuggestResponse
 
 router = APIRouter()
 
 
-@router.get("", response_model=TagListResponse)
+@router.get(
+    "",
+    response_model=TagListResponse,
+    dependencies=[Depends(versioned_cache_control)],
+)
 def list_tags(
     db: Session = Depends(get_db),
     user_id: str = Depends(get_request_user_id),
@@ -18,3 +29,29 @@ def list_tags(
     stmt = select(Tag).where(Tag.user_id == user_id).order_by(Tag.name.asc())
     tags = db.scalars(stmt).all()
     return TagListResponse(items=[TagItem(id=tag.id, name=tag.name) for tag in tags])
+
+
+@router.get(
+    "/suggest",
+    response_model=TagSuggestResponse,
+    dependencies=[Depends(cache_control(CACHE_PRIVATE_SHORT))],
+)
+def suggest_tags(
+    prefix: str = Query(default="", max_length=255),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_request_user_id),
+):
+    """Return tags starting with the prefix, most used and most recent first."""
+    entries = tag_index.suggest(db, user_id, prefix.strip(), limit)
+    return TagSuggestResponse(
+        items=[
+            TagSuggestion(
+                id=entry.id,
+                name=entry.name,
+                usage_count=entry.usage_count,
+                last_used_at=entry.last_used_at,
+            )
+            for entry in entries
+        ]
+    )
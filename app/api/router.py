@@ -1,12 +1,23 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.endpoints import auth, dashboard, health, sessions, tags
+from app.api.deps import CACHE_NO_STORE, cache_control
+from app.api.endpoints import auth, dashboard, goals, health, sessions, sync, tags
 from app.core.config import settings
 
 api_router = APIRouter(prefix=settings.api_v1_prefix)
 
-api_router.include_router(health.router, prefix="/health", tags=["health"])
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+no_store = [Depends(cache_control(CACHE_NO_STORE))]
+
+api_router.include_router(
+    health.router, prefix="/health", tags=["health"], dependencies=no_store
+)
+api_router.include_router(
+    auth.router, prefix="/auth", tags=["auth"], dependencies=no_store
+)
 api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(tags.router, prefix="/tags", tags=["tags"])
+api_router.include_router(goals.router, prefix="/goals", tags=["goals"])
+api_router.include_router(
+    sync.router, prefix="/sync", tags=["sync"], dependencies=no_store
+)
@@ -0,0 +1,246 @@
+"""
+Content-Encoding negotiation for API responses.
+
+``CompressionMiddleware`` is a pure ASGI middleware: it compresses each body
+chunk as it passes through instead of buffering the whole response, so
+streaming responses keep streaming. zstd and brotli are used when their
+optional packages are installed and the client accepts them; gzip is always
+available.
+"""
+
+import zlib
+from typing import Callable, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Levels tuned for dynamic JSON: most of the size win for little CPU.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "text/",
+)
+
+
+class Encoder(Protocol):
+    """Incremental compressor; ``flush`` emits everything compressed so far."""
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipEncoder:
+    def __init__(self) -> None:
+        # wbits=31 writes the gzip header and trailer.
+        self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self) -> None:
+        self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class ZstdEncoder:
+    def __init__(self) -> None:
+        self._obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encoders() -> dict[str, Callable[[], Encoder]]:
+    """Return supported encodings in server preference order."""
+    encoders: dict[str, Callable[[], Encoder]] = {}
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    encoders["gzip"] = GzipEncoder
+    return encoders
+
+
+def negotiate(accept_encoding: str, supported: list[str]) -> str | None:
+    """
+    Pick the encoding to use for an ``Accept-Encoding`` header value.
+
+    The client's q-values win; ties go to the server's preference order.
+    ``identity`` and unknown codings are never chosen.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best: str | None = None
+    best_q = 0.0
+    for coding in supported:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress responses whose body is at least ``minimum_size`` bytes.
+
+    A response that arrives in a single chunk smaller than the threshold is
+    passed through untouched. Streaming responses are compressed chunk by
+    chunk, and each chunk is flushed so clients receive data as it is
+    produced. Responses that already carry a Content-Encoding, or whose
+    content type does not compress well, are left alone.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = available_encoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept, list(self.encoders))
+        responder = _CompressionResponder(
+            self.app,
+            send,
+            encoding,
+            self.encoders[encoding] if encoding else None,
+            self.minimum_size,
+        )
+        await responder(scope, receive)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        app: ASGIApp,
+        send: Send,
+        encoding: str | None,
+        encoder_factory: Callable[[], Encoder] | None,
+        minimum_size: int,
+    ) -> None:
+        self.app = app
+        self.send = send
+        self.encoding = encoding
+        self.encoder_factory = encoder_factory
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.encoder: Encoder | None = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows how big it is.
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            if headers.get("content-encoding") or not _compressible(
+                headers.get("content-type", "")
+            ):
+                self.passthrough = True
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self._send_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoder_factory is None or (
+                not more_body and len(body) < self.minimum_size
+            ):
+                self.passthrough = True
+                await self._send_start()
+                await self.send(message)
+                return
+            self.encoder = self.encoder_factory()
+            headers["Content-Encoding"] = self.encoding
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._send_start()
+
+        if more_body:
+            chunk = self.encoder.compress(body) + self.encoder.flush()
+        else:
+            chunk = self.encoder.compress(body) + self.encoder.finish()
+        await self.send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+    async def _send_start(self) -> None:
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return any(
+        media_type.startswith(prefix) if prefix.endswith("/") else media_type == prefix
+        for prefix in COMPRESSIBLE_TYPES
+    )
@@ -13,8 +13,27 @@ class Settings(BaseSettings):
     default_user_password: str = "demo-password"
     cors_allow_origins: list[str] = ["http://localhost:5173"]
 
+    tag_index_max_users: int = 1024
+    tag_index_ttl_seconds: int = 300
+    insights_cache_max_users: int = 1024
+
+    # Responses smaller than this are sent uncompressed.
+    compression_minimum_size: int = 1024
+    dashboard_cache_max_age_seconds: int = 30
+
+    # Sessions older than the horizon are moved to Arrow IPC files under
+    # archive_uri (a local path or any pyarrow-supported filesystem URI).
+    archive_horizon_days: int = 365
+    archive_uri: str = "./archive"
+
     app_env: str = "local"
     database_url: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    health_check_interval_seconds: float = 5.0
+    # Bounded wait for per-user write locks before a write is retried.
+    db_lock_timeout_ms: int = 2000
+    db_write_attempts: int = 3
 
     model_config = SettingsConfigDict(
         env_file=".env",
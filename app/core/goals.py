@@ -0,0 +1,126 @@
+"""
+Goal periods and incremental progress bookkeeping.
+
+Session writes report the minutes they add or remove through
+``record_goal_progress`` while holding the user row lock, so a goal's
+``progress_minutes`` always equals the matching minutes logged in its current
+period. Rollover is lazy: a goal whose ``period_start`` is behind the current
+period is moved forward on the next write and read as zero until then, which
+holds because session writes reject start days after today.
+Session days are UTC calendar days, matching ``date(start_time)`` in SQL.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.goal import Goal
+from app.models.study_session import StudySession
+from app.models.tag import SessionTag
+
+GOAL_PERIODS = ("daily", "weekly")
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def session_day(start_time: datetime) -> date:
+    """Return the UTC calendar day a session is counted on."""
+    if start_time.tzinfo is None:
+        return start_time.date()
+    return start_time.astimezone(timezone.utc).date()
+
+
+def period_start(period: str, day: date) -> date:
+    if period == "daily":
+        return day
+    if period == "weekly":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown period {period!r}")
+
+
+def period_end(period: str, start: date) -> date:
+    """Return the last day (inclusive) of the period starting at ``start``."""
+    return start if period == "daily" else start + timedelta(days=6)
+
+
+def current_progress(goal: Goal, today: date | None = None) -> tuple[date, int]:
+    """Return (period_start, progress_minutes) for the goal's current period."""
+    start = period_start(goal.period, today or utc_today())
+    if goal.period_start < start:
+        return start, 0
+    return goal.period_start, goal.progress_minutes
+
+
+def period_minutes(
+    db: Session, user_id: str, period: str, start: date, tag_id: int | None
+) -> int:
+    """
+    Sum a period's matching session minutes straight from study_sessions.
+
+    Only used when a goal is created or redefined; session writes keep the
+    counter current afterwards.
+    """
+    lower = datetime.combine(start, time.min, timezone.utc)
+    upper = datetime.combine(
+        period_end(period, start) + timedelta(days=1), time.min, timezone.utc
+    )
+    stmt = select(func.coalesce(func.sum(StudySession.duration_minutes), 0)).where(
+        StudySession.user_id == user_id,
+        StudySession.start_time >= lower,
+        StudySession.start_time < upper,
+    )
+    if tag_id is not None:
+        stmt = stmt.join(SessionTag, SessionTag.session_id == StudySession.id).where(
+            SessionTag.tag_id == tag_id
+        )
+    return int(db.execute(stmt).scalar_one())
+
+
+def record_goal_progress(
+    db: Session,
+    user_id: str,
+    changes: Iterable[tuple[datetime, int, Iterable[int]]],
+    today: date | None = None,
+) -> None:
+    """
+    Apply session minute changes to the user's goals.
+
+    ``changes`` holds ``(start_time, minutes, tag_ids)`` per session; minutes
+    are negative when a session is removed or its old version replaced.
+    Changes in past periods do not affect a goal; later periods cannot occur
+    because session writes reject start days after today. The caller must hold
+    the user row lock.
+    """
+    changes = [
+        (session_day(start_time), minutes, set(tag_ids))
+        for start_time, minutes, tag_ids in changes
+        if minutes
+    ]
+    if not changes:
+        return
+    goals = db.scalars(select(Goal).where(Goal.user_id == user_id)).unique().all()
+    if not goals:
+        return
+
+    today = today or utc_today()
+    deltas: dict[int, int] = defaultdict(int)
+    for goal in goals:
+        current = period_start(goal.period, today)
+        for day, minutes, tag_ids in changes:
+            if period_start(goal.period, day) != current:
+                continue
+            if goal.tag_id is not None and goal.tag_id not in tag_ids:
+                continue
+            deltas[goal.id] += minutes
+
+    for goal in goals:
+        if goal.id not in deltas:
+            continue
+        start, progress = current_progress(goal, today)
+        goal.period_start = start
+        goal.progress_minutes = max(progress + deltas[goal.id], 0)
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight computation and everyone waiting on it."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _resolve(future: asyncio.Future, call: _Call) -> None:
+    if future.done():
+        return
+    if call.error is not None:
+        future.set_exception(call.error)
+    else:
+        future.set_result(call.result)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key runs the computation; callers arriving while it
+    is in flight wait for and share its result (or exception). Nothing is
+    cached afterwards. Sync callers (threadpool handlers) block on a thread
+    event, async callers await a future resolved on their own loop, and the two
+    can be mixed under the same key.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+        _registry.append(self)
+
+    def _join(self, key: Hashable) -> tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.executed += 1
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        with self._lock:
+            del self._calls[key]
+            waiters, call.async_waiters = call.async_waiters, []
+            call.done.set()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, call)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            return call.outcome()
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+        finally:
+            self._finish(key, call)
+        return call.outcome()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        call, leader = self._join(key)
+        if not leader:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            with self._lock:
+                if call.done.is_set():
+                    return call.outcome()
+                call.async_waiters.append((loop, future))
+            # shield: a cancelled follower must not cancel the shared result.
+            return await asyncio.shield(future)
+        try:
+            call.result = await fn()
+        except BaseException as exc:
+            call.error = exc
+        finally:
+            self._finish(key, call)
+        return call.outcome()
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            "name": self.name,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": in_flight,
+        }
+
+
+_registry: list[SingleFlight] = []
+
+
+def all_stats() -> list[dict[str, int | str]]:
+    """Return counters for every SingleFlight group in this worker."""
+    return [group.stats() for group in _registry]
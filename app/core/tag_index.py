@@ -0,0 +1,138 @@
+import bisect
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.tag import Tag
+from app.models.user import User
+
+
+@dataclass
+class TagEntry:
+    id: int
+    name: str
+    usage_count: int
+    last_used_at: datetime | None
+
+    def rank_key(self) -> tuple:
+        last_used = self.last_used_at.timestamp() if self.last_used_at else 0.0
+        return (-self.usage_count, -last_used, self.name)
+
+
+class _UserTags:
+    """Tags of one user kept sorted by case-folded name for prefix scans."""
+
+    def __init__(self, entries: Iterable[TagEntry], version: int) -> None:
+        self.loaded_at = time.monotonic()
+        # The user's sync_version in the snapshot the entries were read from.
+        self.version = version
+        self.by_id: dict[int, TagEntry] = {}
+        self.keys: list[str] = []
+        self.entries: list[TagEntry] = []
+        for entry in sorted(entries, key=lambda e: e.name.casefold()):
+            self.by_id[entry.id] = entry
+            self.keys.append(entry.name.casefold())
+            self.entries.append(entry)
+
+    def add(self, entry: TagEntry) -> None:
+        key = entry.name.casefold()
+        idx = bisect.bisect_right(self.keys, key)
+        self.keys.insert(idx, key)
+        self.entries.insert(idx, entry)
+        self.by_id[entry.id] = entry
+
+    def suggest(self, prefix: str, limit: int) -> list[TagEntry]:
+        key = prefix.casefold()
+        lo = bisect.bisect_left(self.keys, key)
+        hi = bisect.bisect_left(self.keys, key + "\U0010ffff", lo)
+        return heapq.nsmallest(limit, self.entries[lo:hi], key=TagEntry.rank_key)
+
+
+class TagIndex:
+    """
+    Per-user in-memory prefix index over tags, ranked by usage and recency.
+
+    Users are loaded on first lookup and evicted LRU. Entries are patched in
+    place after committed session writes; a write whose sync version is not
+    newer than the load already shows in the loaded counts and is skipped.
+    The TTL bounds staleness from writes served by other worker processes.
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._users: LRUCache[str, _UserTags] = LRUCache(max_users)
+        self._lock = threading.Lock()
+
+    def suggest(
+        self, db: Session, user_id: str, prefix: str, limit: int
+    ) -> list[TagEntry]:
+        tags = self._users.get(user_id)
+        if tags is None or time.monotonic() - tags.loaded_at > self.ttl_seconds:
+            tags = self._load(db, user_id)
+            self._users.set(user_id, tags)
+        with self._lock:
+            return tags.suggest(prefix, limit)
+
+    def record_usage(
+        self,
+        user_id: str,
+        tags: Iterable[tuple[int, str]],
+        delta: int,
+        version: int,
+        used_at: datetime | None = None,
+    ) -> None:
+        """Apply a usage change committed under ``version`` to a loaded user."""
+        user_tags = self._users.get(user_id)
+        if user_tags is None or version <= user_tags.version:
+            return
+        with self._lock:
+            for tag_id, name in tags:
+                entry = user_tags.by_id.get(tag_id)
+                if entry is None:
+                    entry = TagEntry(id=tag_id, name=name, usage_count=0, last_used_at=None)
+                    user_tags.add(entry)
+                entry.usage_count = max(entry.usage_count + delta, 0)
+                if delta > 0 and used_at is not None:
+                    entry.last_used_at = used_at
+
+    def invalidate(self, user_id: str) -> None:
+        self._users.pop(user_id)
+
+    @staticmethod
+    def _load(db: Session, user_id: str) -> _UserTags:
+        # One statement, so the version and the counts share a snapshot.
+        stmt = (
+            select(
+                User.sync_version, Tag.id, Tag.name, Tag.usage_count, Tag.last_used_at
+            )
+            .outerjoin(Tag, Tag.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        rows = db.execute(stmt).all()
+        return _UserTags(
+            (
+                TagEntry(
+                    id=row.id,
+                    name=row.name,
+                    usage_count=row.usage_count,
+                    last_used_at=row.last_used_at,
+                )
+                for row in rows
+                if row.id is not None
+            ),
+            version=rows[0].sync_version if rows else 0,
+        )
+
+
+tag_index = TagIndex(
+    max_users=settings.tag_index_max_users,
+    ttl_seconds=settings.tag_index_ttl_seconds,
+)
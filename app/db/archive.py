@@ -0,0 +1,143 @@
+"""Cold storage for archived study sessions as per-user, per-year Arrow IPC files."""
+
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import fs as pafs
+
+from app.core.config import settings
+
+ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("start_time", pa.timestamp("us", tz="UTC")),
+        ("end_time", pa.timestamp("us", tz="UTC")),
+        ("duration_minutes", pa.int32()),
+        ("focus_level", pa.int8()),
+        ("memo", pa.string()),
+        ("tags", pa.list_(pa.string())),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ]
+)
+
+_WRITE_OPTIONS = pa.ipc.IpcWriteOptions(compression="zstd")
+
+
+def _filesystem() -> tuple[pafs.FileSystem, str]:
+    filesystem, root = pafs.FileSystem.from_uri(_absolute(settings.archive_uri))
+    return filesystem, root.rstrip("/")
+
+
+def _absolute(uri: str) -> str:
+    if "://" in uri:
+        return uri
+    return Path(uri).resolve().as_uri()
+
+
+def _user_dir(root: str, user_id: str) -> str:
+    return f"{root}/{quote(user_id, safe='')}"
+
+
+def _open_table(filesystem: pafs.FileSystem, path: str) -> pa.Table:
+    """Read an archive file, memory-mapping it when it lives on local disk."""
+    if isinstance(filesystem, pafs.LocalFileSystem):
+        source = pa.memory_map(path, "r")
+    else:
+        source = filesystem.open_input_file(path)
+    with source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def write_sessions(user_id: str, year: int, rows: list[dict]) -> None:
+    """
+    Merge rows into the user's archive file for the given year.
+
+    Rows already present (by id) are replaced, so re-running an interrupted
+    archival pass is safe. The file is written beside the target and moved
+    into place to keep readers from seeing a partial file.
+    """
+    filesystem, root = _filesystem()
+    directory = _user_dir(root, user_id)
+    path = f"{directory}/{year}.arrow"
+    filesystem.create_dir(directory, recursive=True)
+
+    table = pa.Table.from_pylist(rows, schema=ARCHIVE_SCHEMA)
+    if filesystem.get_file_info(path).type == pafs.FileType.File:
+        existing = _open_table(filesystem, path)
+        keep = pc.invert(pc.is_in(existing["id"], value_set=table["id"]))
+        table = pa.concat_tables([existing.filter(keep), table])
+    table = table.sort_by("start_time")
+
+    tmp_path = f"{path}.tmp"
+    with filesystem.open_output_stream(tmp_path) as sink:
+        with pa.ipc.new_file(sink, ARCHIVE_SCHEMA, options=_WRITE_OPTIONS) as writer:
+            writer.write_table(table)
+    filesystem.move(tmp_path, path)
+
+
+def read_table(
+    user_id: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    columns: list[str] | None = None,
+    exclude_ids: Iterable[int] = (),
+) -> pa.Table:
+    """
+    Return archived sessions whose start_time falls in the date range.
+
+    The archival job writes a session's file before it deletes the hot row, so
+    for a moment both copies exist; callers pass the IDs they already read
+    from study_sessions as ``exclude_ids`` so the hot row wins.
+    """
+    filesystem, root = _filesystem()
+    directory = _user_dir(root, user_id)
+    selector = pafs.FileSelector(directory, allow_not_found=True)
+    years = sorted(
+        int(info.base_name.removesuffix(".arrow"))
+        for info in filesystem.get_file_info(selector)
+        if info.type == pafs.FileType.File and info.base_name.endswith(".arrow")
+    )
+    if start_date:
+        years = [y for y in years if y >= start_date.year]
+    if end_date:
+        years = [y for y in years if y <= end_date.year]
+
+    lower = datetime.combine(start_date, time.min, timezone.utc) if start_date else None
+    upper = (
+        datetime.combine(end_date + timedelta(days=1), time.min, timezone.utc)
+        if end_date
+        else None
+    )
+    excluded = pa.array(list(exclude_ids), type=pa.int64())
+    tables: list[pa.Table] = []
+    for year in years:
+        table = _open_table(filesystem, f"{directory}/{year}.arrow")
+        if lower is not None:
+            table = table.filter(pc.greater_equal(table["start_time"], pa.scalar(lower)))
+        if upper is not None:
+            table = table.filter(pc.less(table["start_time"], pa.scalar(upper)))
+        if len(excluded):
+            table = table.filter(pc.invert(pc.is_in(table["id"], value_set=excluded)))
+        tables.append(table.select(columns) if columns else table)
+    if not tables:
+        schema = ARCHIVE_SCHEMA
+        if columns:
+            schema = pa.schema([ARCHIVE_SCHEMA.field(name) for name in columns])
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def read_sessions(
+    user_id: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    exclude_ids: Iterable[int] = (),
+) -> list[dict]:
+    """Return archived sessions in the date range as row dicts."""
+    return read_table(
+        user_id, start_date, end_date, exclude_ids=exclude_ids
+    ).to_pylist()
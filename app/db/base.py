@@ -6,4 +6,12 @@ class Base(DeclarativeBase):
 
 
 # Import models here for Alembic autogeneration and metadata discovery.
-from app.models import study_session, tag, user  # noqa: E402,F401
+from app.models import (  # noqa: E402,F401
+    daily_rollup,
+    goal,
+    report,
+    study_session,
+    sync_tombstone,
+    tag,
+    user,
+)
@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DatabaseStatus:
+    ok: bool
+    checked_at: datetime
+    latency_ms: float | None = None
+    pool: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+
+
+class DatabaseMonitor:
+    """
+    Background-refreshed database status so probes never touch the pool.
+
+    A daemon thread runs ``SELECT 1`` every ``interval`` seconds and stores the
+    outcome together with pool counters. Readiness also requires that startup
+    warm-up has finished and that the last check is recent.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.interval = 5.0
+        self.warmed_up = False
+        self._status = DatabaseStatus(ok=False, checked_at=datetime.now(timezone.utc))
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def status(self) -> DatabaseStatus:
+        return self._status
+
+    def is_ready(self) -> bool:
+        status = self._status
+        age = (datetime.now(timezone.utc) - status.checked_at).total_seconds()
+        return self.warmed_up and status.ok and age <= self.interval * 3
+
+    def check(self) -> DatabaseStatus:
+        started = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            status = DatabaseStatus(
+                ok=False,
+                checked_at=datetime.now(timezone.utc),
+                pool=self._pool_counters(),
+                error=exc.__class__.__name__,
+            )
+        else:
+            status = DatabaseStatus(
+                ok=True,
+                checked_at=datetime.now(timezone.utc),
+                latency_ms=round((time.perf_counter() - started) * 1000, 2),
+                pool=self._pool_counters(),
+            )
+        self._status = status
+        return status
+
+    def warm_up(
+        self, connections: int, primers: Iterable[Callable[[Session], object]] = ()
+    ) -> None:
+        """
+        Open pool connections up front and compile the hot statements once.
+
+        Warm-up is best effort: failures are logged and readiness then simply
+        follows the periodic check.
+        """
+        # Check out connections concurrently so the pool really grows to size.
+        barrier = threading.Barrier(connections)
+
+        def hold_connection(_: int) -> None:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                try:
+                    barrier.wait(timeout=5)
+                except threading.BrokenBarrierError:
+                    pass
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=connections) as pool:
+                list(pool.map(hold_connection, range(connections)))
+            with Session(self.engine) as db:
+                for primer in primers:
+                    primer(db)
+                db.rollback()
+        except Exception:
+            logger.exception("Database warm-up failed")
+        else:
+            logger.info(
+                "Warmed %d DB connections in %.0f ms",
+                connections,
+                (time.perf_counter() - started) * 1000,
+            )
+        self.check()
+        self.warmed_up = True
+
+    def start(self, interval: float) -> None:
+        self.interval = interval
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="db-health-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def _pool_counters(self) -> dict[str, int]:
+        pool = self.engine.pool
+        counters: dict[str, int] = {}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            getter = getattr(pool, name, None)
+            if getter is not None:
+                counters[name] = int(getter())
+        return counters
@@ -1,12 +1,29 @@
+import random
+import time
 from contextlib import contextmanager
+from typing import Callable, TypeVar
 
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.health import DatabaseMonitor
 
-engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
+engine = create_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    future=True,
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+db_monitor = DatabaseMonitor(engine)
+
+T = TypeVar("T")
+
+# serialization_failure, deadlock_detected, lock_not_available (lock_timeout)
+RETRYABLE_PGCODES = {"40001", "40P01", "55P03"}
 
 
 def get_db():
@@ -30,3 +47,27 @@ def session_scope() -> Session:
         raise
     finally:
         session.close()
+
+
+def is_retryable(exc: DBAPIError) -> bool:
+    """Whether the error is a transient lock or serialization conflict."""
+    return getattr(exc.orig, "pgcode", None) in RETRYABLE_PGCODES
+
+
+def run_with_retry(db: Session, fn: Callable[[], T], attempts: int | None = None) -> T:
+    """
+    Run a write transaction, retrying it on lock timeouts and conflicts.
+
+    ``fn`` must perform the whole transaction including commit; it is rolled
+    back and re-run from scratch with jittered exponential backoff.
+    """
+    attempts = attempts or settings.db_write_attempts
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except DBAPIError as exc:
+            db.rollback()
+            if attempt == attempts or not is_retryable(exc):
+                raise
+            time.sleep(0.05 * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+    raise AssertionError("unreachable")
@@ -0,0 +1,233 @@
+"""
+Move study sessions older than the archive horizon into cold storage.
+
+Run with ``python -m app.jobs.archive_sessions``. Each user is handled in its
+own transaction: sessions are written to Arrow IPC files, their per-day totals
+are folded into ``daily_rollups`` and ``tag_daily_rollups``, and only then are
+the rows deleted from ``study_sessions``. Re-running after an interruption is
+safe.
+
+``--rebuild-tag-rollups`` recomputes ``tag_daily_rollups`` from the archive
+files, for users archived before that table existed.
+"""
+
+import argparse
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import archive
+from app.db.session import session_scope
+from app.models.daily_rollup import DailyRollup, TagDailyRollup
+from app.models.study_session import StudySession
+from app.models.tag import SessionTag, Tag
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def archive_user(db: Session, user_id: str, cutoff: date) -> int:
+    """Archive one user's sessions that started before the cutoff day."""
+    # Lock the user row so session writes for this user wait for the move.
+    db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+    day_expr = func.date(StudySession.start_time)
+    old = day_expr < cutoff
+    sessions = (
+        db.scalars(
+            select(StudySession)
+            .where(StudySession.user_id == user_id, old)
+            .order_by(StudySession.start_time.asc())
+        )
+        .unique()
+        .all()
+    )
+    if not sessions:
+        return 0
+    # Moving history changes what whole-history views (insights) are built
+    # from, so invalidate caches keyed on the change counter.
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(sync_version=User.sync_version + 1)
+    )
+
+    by_year: dict[int, list[dict]] = defaultdict(list)
+    for session in sessions:
+        by_year[session.start_time.year].append(
+            {
+                "id": session.id,
+                "start_time": session.start_time,
+                "end_time": session.end_time,
+                "duration_minutes": session.duration_minutes,
+                "focus_level": session.focus_level,
+                "memo": session.memo,
+                "tags": [tag.name for tag in session.tags],
+                "created_at": session.created_at,
+            }
+        )
+    for year, rows in by_year.items():
+        archive.write_sessions(user_id, year, rows)
+
+    totals = (
+        select(
+            StudySession.user_id,
+            day_expr.label("day"),
+            func.sum(StudySession.duration_minutes),
+            func.count(StudySession.id),
+            func.sum(StudySession.focus_level),
+        )
+        .where(StudySession.user_id == user_id, old)
+        .group_by(StudySession.user_id, day_expr)
+    )
+    upsert = insert(DailyRollup).from_select(
+        ["user_id", "day", "total_minutes", "session_count", "focus_sum"], totals
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[DailyRollup.user_id, DailyRollup.day],
+        set_={
+            "total_minutes": DailyRollup.total_minutes + upsert.excluded.total_minutes,
+            "session_count": DailyRollup.session_count + upsert.excluded.session_count,
+            "focus_sum": DailyRollup.focus_sum + upsert.excluded.focus_sum,
+        },
+    )
+    db.execute(upsert)
+
+    tag_totals = (
+        select(
+            StudySession.user_id,
+            day_expr.label("day"),
+            SessionTag.tag_id,
+            func.sum(StudySession.duration_minutes),
+        )
+        .join(SessionTag, SessionTag.session_id == StudySession.id)
+        .where(StudySession.user_id == user_id, old)
+        .group_by(StudySession.user_id, day_expr, SessionTag.tag_id)
+    )
+    tag_upsert = insert(TagDailyRollup).from_select(
+        ["user_id", "day", "tag_id", "total_minutes"], tag_totals
+    )
+    tag_upsert = tag_upsert.on_conflict_do_update(
+        index_elements=[
+            TagDailyRollup.user_id,
+            TagDailyRollup.day,
+            TagDailyRollup.tag_id,
+        ],
+        set_={
+            "total_minutes": TagDailyRollup.total_minutes
+            + tag_upsert.excluded.total_minutes
+        },
+    )
+    db.execute(tag_upsert)
+
+    # usage_count counts sessions still in study_sessions; release the moved ones.
+    archived_tags = (
+        select(SessionTag.tag_id, func.count().label("sessions"))
+        .join(StudySession, StudySession.id == SessionTag.session_id)
+        .where(StudySession.user_id == user_id, old)
+        .group_by(SessionTag.tag_id)
+        .subquery()
+    )
+    db.execute(
+        update(Tag)
+        .where(Tag.id == archived_tags.c.tag_id)
+        .values(
+            usage_count=func.greatest(Tag.usage_count - archived_tags.c.sessions, 0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        delete(StudySession)
+        .where(StudySession.user_id == user_id, old)
+        .execution_options(synchronize_session=False)
+    )
+    return len(sessions)
+
+
+def run(horizon_days: int | None = None) -> int:
+    """Archive every user's old sessions and return the number moved."""
+    horizon = horizon_days if horizon_days is not None else settings.archive_horizon_days
+    cutoff = date.today() - timedelta(days=horizon)
+
+    with session_scope() as db:
+        user_ids = db.scalars(
+            select(StudySession.user_id)
+            .where(func.date(StudySession.start_time) < cutoff)
+            .distinct()
+        ).all()
+
+    moved = 0
+    for user_id in user_ids:
+        with session_scope() as db:
+            count = archive_user(db, user_id, cutoff)
+        moved += count
+        logger.info("Archived %d sessions for user %s", count, user_id)
+    logger.info("Archived %d sessions older than %s", moved, cutoff)
+    return moved
+
+
+def rebuild_tag_rollups(db: Session, user_id: str) -> int:
+    """Replace one user's tag_daily_rollups with totals read from the archive."""
+    db.execute(select(User.id).where(User.id == user_id).with_for_update())
+    table = archive.read_table(
+        user_id, columns=["start_time", "duration_minutes", "tags"]
+    )
+    tag_ids = dict(
+        db.execute(select(Tag.name, Tag.id).where(Tag.user_id == user_id)).all()
+    )
+    totals: dict[tuple[date, int], int] = defaultdict(int)
+    for start_time, minutes, names in zip(
+        table["start_time"].to_pylist(),
+        table["duration_minutes"].to_pylist(),
+        table["tags"].to_pylist(),
+    ):
+        for name in names:
+            if name in tag_ids:
+                totals[(start_time.date(), tag_ids[name])] += minutes
+
+    db.execute(delete(TagDailyRollup).where(TagDailyRollup.user_id == user_id))
+    if totals:
+        db.execute(
+            insert(TagDailyRollup),
+            [
+                {
+                    "user_id": user_id,
+                    "day": day,
+                    "tag_id": tag_id,
+                    "total_minutes": total,
+                }
+                for (day, tag_id), total in totals.items()
+            ],
+        )
+    return len(totals)
+
+
+def rebuild_all_tag_rollups() -> None:
+    with session_scope() as db:
+        user_ids = db.scalars(select(DailyRollup.user_id).distinct()).all()
+    for user_id in user_ids:
+        with session_scope() as db:
+            rows = rebuild_tag_rollups(db, user_id)
+        logger.info("Rebuilt %d tag rollups for user %s", rows, user_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--horizon-days", type=int, default=None)
+    parser.add_argument("--rebuild-tag-rollups", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.rebuild_tag_rollups:
+        rebuild_all_tag_rollups()
+    else:
+        run(args.horizon_days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Recount ``tags.usage_count`` from ``session_tags``.
+
+Run once with ``python -m app.jobs.backfill_tag_usage`` after deploying the
+usage counters: tags that existed before then start at zero. Session writes
+keep the counters current afterwards, so the job only needs re-running if
+they are suspected to have drifted. Each user is recounted in its own
+transaction under the user row lock, so it is safe to run while the API is
+serving writes, and re-running is harmless.
+"""
+
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.session import session_scope
+from app.models.study_session import StudySession
+from app.models.tag import SessionTag, Tag
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_user(db: Session, user_id: str) -> int:
+    """Recount usage for one user's tags and return the number of tags updated."""
+    # Session writes take the same lock, so no increment can be lost.
+    db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+    usage = (
+        select(func.count())
+        .select_from(SessionTag)
+        .where(SessionTag.tag_id == Tag.id)
+        .scalar_subquery()
+    )
+    last_used = (
+        select(func.max(StudySession.created_at))
+        .join(SessionTag, SessionTag.session_id == StudySession.id)
+        .where(SessionTag.tag_id == Tag.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Tag)
+        .where(Tag.user_id == user_id)
+        .values(
+            usage_count=usage,
+            last_used_at=func.coalesce(Tag.last_used_at, last_used),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+
+def run() -> int:
+    """Recount usage for every user with tags and return the number of tags."""
+    with session_scope() as db:
+        user_ids = db.scalars(select(Tag.user_id).distinct()).all()
+
+    updated = 0
+    for user_id in user_ids:
+        with session_scope() as db:
+            updated += backfill_user(db, user_id)
+    logger.info("Recounted usage for %d tags of %d users", updated, len(user_ids))
+    return updated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
@@ -0,0 +1,309 @@
+"""
+Batch generator for weekly and monthly user digests.
+
+Run with ``python -m app.jobs.user_digests weekly`` (or ``monthly``). Users are
+split into contiguous ID ranges that a process pool works through; each range
+streams its sessions with a server-side cursor, aggregates them with NumPy
+group operations and upserts one row per user into ``reports``. Users who
+already have a report for the period are skipped, both when the ranges are
+planned and inside each range, so an interrupted run can simply be started
+again without recomputing finished digests.
+"""
+
+import argparse
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dt_time
+from typing import Iterator, Sequence
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.session import SessionLocal, engine
+from app.models.report import Report
+from app.models.study_session import StudySession
+from app.models.tag import SessionTag, Tag
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH_SIZE = 50_000
+TOP_TAG_COUNT = 3
+
+
+@dataclass(frozen=True)
+class Period:
+    name: str
+    start: date
+    end: date
+
+    @property
+    def start_dt(self) -> datetime:
+        return datetime.combine(self.start, dt_time.min, timezone.utc)
+
+    @property
+    def end_dt(self) -> datetime:
+        return datetime.combine(self.end + timedelta(days=1), dt_time.min, timezone.utc)
+
+
+def previous_period(name: str, today: date | None = None) -> Period:
+    """Return the last complete week (Mon-Sun) or calendar month before today."""
+    today = today or date.today()
+    if name == "weekly":
+        start = today - timedelta(days=today.weekday() + 7)
+        return Period(name, start, start + timedelta(days=6))
+    if name == "monthly":
+        end = today.replace(day=1) - timedelta(days=1)
+        return Period(name, end.replace(day=1), end)
+    raise ValueError(f"Unknown period {name!r}")
+
+
+def _init_worker() -> None:
+    # Connections inherited from the parent process must not be shared.
+    engine.dispose(close=False)
+
+
+def _partitions(db, stmt) -> Iterator[Sequence]:
+    """Yield result rows in batches of STREAM_BATCH_SIZE from a server-side cursor."""
+    result = db.execute(
+        stmt.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE)
+    )
+    yield from result.partitions()
+
+
+def process_range(period: Period, first_id: str, last_id: str) -> tuple[int, int]:
+    """
+    Compute and store digests for users with IDs in [first_id, last_id].
+
+    Users in the range that already have a report for the period are left out.
+
+    Sessions are folded into per-user sums one streamed batch at a time, so a
+    worker's memory is bounded by the batch size and the number of users, not
+    by the number of sessions in its range.
+    """
+    done = _reported_user_ids(period)
+    in_range = (User.id >= first_id) & (User.id <= last_id) & User.id.not_in(done)
+    in_period = (StudySession.start_time >= period.start_dt) & (
+        StudySession.start_time < period.end_dt
+    )
+    with SessionLocal() as db:
+        users = db.execute(select(User.id, User.current_streak).where(in_range)).all()
+        if not users:
+            return 0, 0
+        # searchsorted needs Python ordering, which may differ from the DB collation.
+        users.sort(key=lambda row: row.id)
+        user_ids = np.array([row.id for row in users], dtype=object)
+        streaks = np.array([row.current_streak for row in users], dtype=np.int64)
+        n_users = len(user_ids)
+
+        # Per-user sums of minutes, sessions, focus, x, x*x and x*focus, where x
+        # is the day offset used for the least-squares focus trend.
+        sums = np.zeros((6, n_users), dtype=np.float64)
+        session_total = 0
+        for partition in _partitions(
+            db,
+            select(
+                StudySession.user_id,
+                cast(func.extract("epoch", StudySession.start_time), Float),
+                StudySession.duration_minutes,
+                StudySession.focus_level,
+            ).where(
+                StudySession.user_id >= first_id,
+                StudySession.user_id <= last_id,
+                StudySession.user_id.not_in(done),
+                in_period,
+            ),
+        ):
+            columns = list(zip(*partition))
+            codes = np.searchsorted(user_ids, np.array(columns[0], dtype=object))
+            epochs = np.array(columns[1], dtype=np.float64)
+            minutes = np.array(columns[2], dtype=np.float64)
+            focus = np.array(columns[3], dtype=np.float64)
+            x = (epochs - period.start_dt.timestamp()) / 86_400.0
+            for row, weights in enumerate((minutes, None, focus, x, x * x, x * focus)):
+                sums[row] += np.bincount(codes, weights=weights, minlength=n_users)
+            session_total += len(partition)
+
+        pair_minutes: dict[tuple[int, str], float] = defaultdict(float)
+        for partition in _partitions(
+            db,
+            select(StudySession.user_id, Tag.name, StudySession.duration_minutes)
+            .join(SessionTag, SessionTag.session_id == StudySession.id)
+            .join(Tag, Tag.id == SessionTag.tag_id)
+            .where(
+                StudySession.user_id >= first_id,
+                StudySession.user_id <= last_id,
+                StudySession.user_id.not_in(done),
+                in_period,
+            ),
+        ):
+            _add_tag_minutes(pair_minutes, user_ids, partition)
+
+        totals, counts, focus_sums, sx, sxx, sxy = sums
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_focus = focus_sums / counts
+            denom = counts * sxx - sx * sx
+            trend = (counts * sxy - sx * focus_sums) / denom
+        trend[~(np.abs(denom) > 1e-9)] = np.nan
+
+        top_tags = _top_tags(pair_minutes)
+
+        values = [
+            {
+                "user_id": user_ids[i],
+                "period": period.name,
+                "period_start": period.start,
+                "period_end": period.end,
+                "total_minutes": int(totals[i]),
+                "session_count": int(counts[i]),
+                "avg_focus": float(avg_focus[i]) if counts[i] else None,
+                "focus_trend": None if np.isnan(trend[i]) else round(float(trend[i]), 4),
+                "top_tags": top_tags.get(i, []),
+                "current_streak": int(streaks[i]),
+            }
+            for i in range(n_users)
+        ]
+        stmt = insert(Report).values(values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_user_report",
+            set_={
+                column: stmt.excluded[column]
+                for column in (
+                    "period_end",
+                    "total_minutes",
+                    "session_count",
+                    "avg_focus",
+                    "focus_trend",
+                    "top_tags",
+                    "current_streak",
+                )
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+    return n_users, session_total
+
+
+def _add_tag_minutes(
+    pair_minutes: dict[tuple[int, str], float], user_ids: np.ndarray, partition
+) -> None:
+    """Group one batch of (user, tag, minutes) rows and add them to the totals."""
+    columns = list(zip(*partition))
+    user_codes = np.searchsorted(user_ids, np.array(columns[0], dtype=object))
+    names, name_codes = np.unique(np.array(columns[1], dtype=object), return_inverse=True)
+    pair_keys = user_codes.astype(np.int64) * len(names) + name_codes
+    pairs, pair_codes = np.unique(pair_keys, return_inverse=True)
+    minutes = np.bincount(pair_codes, weights=np.array(columns[2], dtype=np.float64))
+    for pair, total in zip(pairs.tolist(), minutes.tolist()):
+        pair_minutes[(pair // len(names), names[pair % len(names)])] += total
+
+
+def _top_tags(pair_minutes: dict[tuple[int, str], float]) -> dict[int, list[dict]]:
+    """Keep the largest few tags per user from the (user, tag) minute totals."""
+    if not pair_minutes:
+        return {}
+    keys = list(pair_minutes)
+    pair_users = np.array([user for user, _ in keys], dtype=np.int64)
+    totals = np.array(list(pair_minutes.values()), dtype=np.float64)
+    order = np.lexsort((-totals, pair_users))
+    pair_users = pair_users[order]
+    group_start = np.r_[0, np.flatnonzero(np.diff(pair_users)) + 1]
+    rank = np.arange(len(pair_users)) - np.repeat(
+        group_start, np.diff(np.r_[group_start, len(pair_users)])
+    )
+
+    result: dict[int, list[dict]] = {}
+    for index in order[rank < TOP_TAG_COUNT]:
+        user_code, name = keys[index]
+        result.setdefault(user_code, []).append(
+            {"name": name, "minutes": int(totals[index])}
+        )
+    return result
+
+
+def _reported_user_ids(period: Period):
+    """Subquery of users that already have a report for the period."""
+    return (
+        select(Report.user_id)
+        .where(Report.period == period.name, Report.period_start == period.start)
+        .scalar_subquery()
+    )
+
+
+def pending_ranges(period: Period, chunk_users: int) -> list[tuple[str, str]]:
+    """
+    Split users without a report for the period into contiguous ID ranges.
+
+    A range's bounds can also enclose users that already have a report;
+    ``process_range`` leaves those out again.
+    """
+    with SessionLocal() as db:
+        pending = db.scalars(
+            select(User.id)
+            .where(User.id.not_in(_reported_user_ids(period)))
+            .order_by(User.id)
+        ).all()
+    return [
+        (pending[i], pending[min(i + chunk_users, len(pending)) - 1])
+        for i in range(0, len(pending), chunk_users)
+    ]
+
+
+def run(period: Period, workers: int, chunk_users: int) -> None:
+    ranges = pending_ranges(period, chunk_users)
+    logger.info(
+        "Generating %s digests for %s..%s: %d ranges pending",
+        period.name,
+        period.start,
+        period.end,
+        len(ranges),
+    )
+    started = time.monotonic()
+    users_done = sessions_done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(process_range, period, lo, hi) for lo, hi in ranges]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            users, sessions = future.result()
+            users_done += users
+            sessions_done += sessions
+            elapsed = max(time.monotonic() - started, 1e-6)
+            logger.info(
+                "%d/%d ranges, %d users (%.0f/s), %d sessions (%.0f/s)",
+                completed,
+                len(ranges),
+                users_done,
+                users_done / elapsed,
+                sessions_done,
+                sessions_done / elapsed,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("period", choices=["weekly", "monthly"])
+    parser.add_argument("--period-start", type=date.fromisoformat, default=None)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-users", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.period_start:
+        # Anchor on the day after the requested period to reuse previous_period.
+        if args.period == "weekly":
+            anchor = args.period_start + timedelta(days=7)
+        else:
+            anchor = (args.period_start.replace(day=1) + timedelta(days=31)).replace(day=1)
+        period = previous_period(args.period, anchor)
+    else:
+        period = previous_period(args.period)
+
+    logging.basicConfig(level=logging.INFO)
+    run(period, args.workers, args.chunk_users)
+
+
+if __name__ == "__main__":
+    main()
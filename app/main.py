@@ -1,12 +1,20 @@
 import logging
+from datetime import date, timedelta
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
 
+from app.api.endpoints.dashboard import _daily_totals_stmt
 from app.api.router import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.core.security import hash_password
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, db_monitor
+from app.models.study_session import StudySession
+from app.models.tag import Tag
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
@@ -20,20 +28,49 @@ def ensure_default_user() -> None:
         existing = db.get(User, settings.default_user_id)
         if existing:
             return
-        user = User(
-            id=settings.default_user_id,
-            email=settings.default_user_email,
-            password_hash=hash_password(settings.default_user_password),
-            name=settings.default_user_name,
+        # Several workers start at once; let the loser of the race no-op.
+        stmt = (
+            insert(User)
+            .values(
+                id=settings.default_user_id,
+                email=settings.default_user_email,
+                password_hash=hash_password(settings.default_user_password),
+                name=settings.default_user_name,
+                current_streak=0,
+                longest_streak=0,
+            )
+            .on_conflict_do_nothing()
         )
-        db.add(user)
+        if db.execute(stmt).rowcount:
+            logger.info("Created default user %s", settings.default_user_id)
         db.commit()
-        logger.info("Created default user %s", settings.default_user_id)
+
+
+def _prime_statements(db: Session) -> None:
+    """Compile the hottest request statements into SQLAlchemy's cache."""
+    user_id = settings.default_user_id
+    today = date.today()
+    db.get(User, user_id)
+    db.execute(_daily_totals_stmt(user_id, today - timedelta(days=6), today)).all()
+    db.scalars(
+        select(StudySession)
+        .where(StudySession.user_id == user_id)
+        .order_by(StudySession.start_time.desc())
+        .limit(10)
+    ).unique().all()
+    db.scalars(select(Tag).where(Tag.user_id == user_id).order_by(Tag.name.asc())).all()
 
 
 @app.on_event("startup")
 def startup_event() -> None:
     ensure_default_user()
+    db_monitor.warm_up(settings.db_pool_size, [_prime_statements])
+    db_monitor.start(settings.health_check_interval_seconds)
+
+
+@app.on_event("shutdown")
+def shutdown_event() -> None:
+    db_monitor.stop()
 
 
 app.add_middleware(
@@ -43,6 +80,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it wraps CORS and compresses every response on the way out.
+app.add_middleware(
+    CompressionMiddleware, minimum_size=settings.compression_minimum_size
+)
 
 app.include_router(api_router)
 
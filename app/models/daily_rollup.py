@@ -0,0 +1,35 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DailyRollup(Base):
+    """Per-day totals kept for sessions moved to cold storage."""
+
+    __tablename__ = "daily_rollups"
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    session_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    focus_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class TagDailyRollup(Base):
+    """Per-tag, per-day minutes kept for sessions moved to cold storage."""
+
+    __tablename__ = "tag_daily_rollups"
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    tag_id: Mapped[int] = mapped_column(
+        ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,40 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class Goal(Base):
+    """Daily or weekly minute target, overall or for a single tag."""
+
+    __tablename__ = "goals"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    period: Mapped[str] = mapped_column(String(16), nullable=False)
+    target_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    tag_id: Mapped[int | None] = mapped_column(
+        ForeignKey("tags.id", ondelete="CASCADE")
+    )
+    # Minutes logged in the period starting at period_start, maintained by the
+    # session writes. An older period_start means nothing was logged since the
+    # period ended; readers then treat progress as zero.
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    progress_minutes: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    tag = relationship("Tag", lazy="joined")
@@ -0,0 +1,43 @@
+from datetime import date, datetime
+
+from sqlalchemy import (
+    JSON,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Report(Base):
+    """Precomputed weekly or monthly digest for a single user."""
+
+    __tablename__ = "reports"
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "period_start", name="uq_user_report"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    period: Mapped[str] = mapped_column(String(16), nullable=False)
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    period_end: Mapped[date] = mapped_column(Date, nullable=False)
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    session_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    avg_focus: Mapped[float | None] = mapped_column(Float)
+    # Least-squares slope of focus_level per day across the period's sessions.
+    focus_trend: Mapped[float | None] = mapped_column(Float)
+    top_tags: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    current_streak: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,6 +1,17 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, SmallInteger, Text, func
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -8,6 +19,17 @@ from app.db.base import Base
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "client_id", name="uq_user_session_client"),
+        Index("ix_study_sessions_user_sync_version", "user_id", "sync_version"),
+        # Covers range aggregates so they can be answered from the index alone.
+        Index(
+            "ix_study_sessions_user_start",
+            "user_id",
+            "start_time",
+            postgresql_include=["duration_minutes", "focus_level"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str] = mapped_column(
@@ -18,9 +40,20 @@ class StudySession(Base):
     duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
     focus_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     memo: Mapped[str | None] = mapped_column(Text)
+    # Client-generated identifier used to make offline pushes idempotent.
+    client_id: Mapped[str | None] = mapped_column(String(64))
+    sync_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
 
     user = relationship("User", back_populates="sessions")
     tags = relationship(
@@ -1,6 +1,15 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -8,13 +17,24 @@ from app.db.base import Base
 
 class Tag(Base):
     __tablename__ = "tags"
-    __table_args__ = (UniqueConstraint("user_id", "name", name="uq_user_tag"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_user_tag"),
+        Index("ix_tags_user_sync_version", "user_id", "sync_version"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    sync_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    # Number of sessions referencing the tag, maintained by the session writes.
+    usage_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    last_used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -27,6 +47,7 @@ class Tag(Base):
 
 class SessionTag(Base):
     __tablename__ = "session_tags"
+    __table_args__ = (Index("ix_session_tags_tag_session", "tag_id", "session_id"),)
 
     session_id: Mapped[int] = mapped_column(
         ForeignKey("study_sessions.id", ondelete="CASCADE"), primary_key=True
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Integer, String, Text, func
+from sqlalchemy import BigInteger, Date, DateTime, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -20,6 +20,10 @@ class User(Base):
     last_study_date: Mapped[date | None] = mapped_column(Date)
     current_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     longest_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Monotonic per-user change counter; every synced write takes the next value.
+    sync_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
 
     sessions = relationship("StudySession", back_populates="user", cascade="all, delete")
     tags = relationship("Tag", back_populates="user", cascade="all, delete-orphan")
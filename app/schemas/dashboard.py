@@ -1,8 +1,10 @@
 from datetime import date
-from typing import List
+from typing import List, Literal
 
 from pydantic import BaseModel
 
+from app.schemas.goal import GoalPublic
+
 
 class TopTag(BaseModel):
     name: str
@@ -46,3 +48,51 @@ class StreakResponse(BaseModel):
     current_streak: int
     longest_streak: int
     last_study_date: date | None
+
+
+class FocusCell(BaseModel):
+    weekday: int
+    hour: int
+    avg_focus: float
+    total_minutes: int
+    session_count: int
+
+
+class FocusTrendPoint(BaseModel):
+    week_start: date
+    avg_focus: float
+    total_minutes: int
+    session_count: int
+
+
+class SessionLengthBucket(BaseModel):
+    min_minutes: int
+    max_minutes: int | None
+    session_count: int
+
+
+class InsightsResponse(BaseModel):
+    session_count: int
+    weekday_hour: List[FocusCell]
+    focus_trend: List[FocusTrendPoint]
+    length_distribution: List[SessionLengthBucket]
+
+
+class TagSeries(BaseModel):
+    name: str
+    total_minutes: int
+    # Minutes per bucket, aligned with TagSeriesResponse.buckets.
+    minutes: List[int]
+
+
+class TagSeriesResponse(BaseModel):
+    start_date: date
+    end_date: date
+    granularity: Literal["day", "week", "month"]
+    buckets: List[date]
+    tags: List[TagSeries]
+
+
+class GoalProgressResponse(BaseModel):
+    date: date
+    goals: List[GoalPublic]
@@ -0,0 +1,30 @@
+from datetime import date
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class GoalCreate(BaseModel):
+    period: Literal["daily", "weekly"]
+    target_minutes: int = Field(ge=1, le=7 * 24 * 60)
+    # Restrict the goal to sessions carrying this tag; None counts every session.
+    tag: str | None = Field(default=None, max_length=255)
+
+
+class GoalUpdate(GoalCreate):
+    pass
+
+
+class GoalPublic(BaseModel):
+    id: int
+    period: Literal["daily", "weekly"]
+    target_minutes: int
+    tag: str | None = None
+    period_start: date
+    period_end: date
+    progress_minutes: int
+    completed: bool
+
+
+class GoalListResponse(BaseModel):
+    items: List[GoalPublic]
@@ -0,0 +1,47 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.schemas.session import SessionCreate, SessionDetail
+from app.schemas.tag import TagItem
+
+
+class SyncSessionCreate(SessionCreate):
+    client_id: str = Field(min_length=1, max_length=64)
+
+
+class SyncPushRequest(BaseModel):
+    sessions: List[SyncSessionCreate] = Field(max_length=500)
+
+
+class SyncSessionItem(SessionDetail):
+    client_id: str | None = None
+    sync_version: int
+
+
+class SyncTagItem(TagItem):
+    sync_version: int
+
+
+class SyncTombstoneItem(BaseModel):
+    entity: str
+    id: int
+    sync_version: int
+
+
+class SyncChangesResponse(BaseModel):
+    token: int
+    sessions: List[SyncSessionItem]
+    tags: List[SyncTagItem]
+    deleted: List[SyncTombstoneItem]
+
+
+class SyncRejectedItem(BaseModel):
+    client_id: str
+    detail: str
+
+
+class SyncPushResponse(BaseModel):
+    items: List[SyncSessionItem]
+    # Items that can never be stored; clients should drop them from their queue.
+    rejected: List[SyncRejectedItem] = Field(default_factory=list)
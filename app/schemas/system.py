@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Dict, List
 
 from pydantic import BaseModel
 
@@ -7,3 +8,27 @@ class HealthResponse(BaseModel):
     status: str
     db: str
     time: datetime
+
+
+class LivenessResponse(BaseModel):
+    status: str
+    time: datetime
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    db: str
+    checked_at: datetime
+    latency_ms: float | None = None
+    pool: Dict[str, int]
+
+
+class SingleFlightStats(BaseModel):
+    name: str
+    executed: int
+    coalesced: int
+    in_flight: int
+
+
+class MetricsResponse(BaseModel):
+    singleflight: List[SingleFlightStats]
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List
 
 from pydantic import BaseModel
@@ -10,3 +11,12 @@ class TagItem(BaseModel):
 
 class TagListResponse(BaseModel):
     items: List[TagItem]
+
+
+class TagSuggestion(TagItem):
+    usage_count: int
+    last_used_at: datetime | None = None
+
+
+class TagSuggestResponse(BaseModel):
+    items: List[TagSuggestion]
@@ -0,0 +1,137 @@
+"""
+Measure bytes on the wire and compression CPU cost for typical API payloads.
+
+Run from the repository root with ``python -m scripts.bench_compression``.
+Payloads are built from the real response schemas and rendered the way
+FastAPI renders them; each available encoding is then timed both for a
+single-chunk body and for the same body streamed in small chunks, which is
+what ``CompressionMiddleware`` does for streaming responses.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.compression import available_encoders
+from app.schemas.dashboard import (
+    DailyPoint,
+    HeatmapCell,
+    HeatmapResponse,
+    WeeklySummaryResponse,
+)
+from app.schemas.session import SessionListResponse, SessionPublic
+
+TAG_NAMES = ["math", "physics", "chemistry", "biology", "english", "history", "coding"]
+STREAM_CHUNK_SIZE = 4096
+
+
+def _heatmap(years: int) -> HeatmapResponse:
+    end = date(2026, 10, 18)
+    start = end - timedelta(days=365 * years - 1)
+    rng = random.Random(1)
+    cells = [
+        HeatmapCell(
+            date=start + timedelta(days=i),
+            total_minutes=rng.choice([0, 0, 0, 25, 50, 90, 120, 180]),
+        )
+        for i in range((end - start).days + 1)
+    ]
+    return HeatmapResponse(start_date=start, end_date=end, cells=cells)
+
+
+def _session_list(count: int) -> SessionListResponse:
+    rng = random.Random(2)
+    started = datetime(2026, 10, 18, 9, tzinfo=timezone.utc)
+    items = []
+    for i in range(count):
+        start = started - timedelta(hours=7 * i)
+        minutes = rng.randint(15, 180)
+        items.append(
+            SessionPublic(
+                id=100_000 - i,
+                start_time=start,
+                end_time=start + timedelta(minutes=minutes),
+                duration_minutes=minutes,
+                focus_level=rng.randint(1, 5),
+                memo=rng.choice([None, "Reviewed lecture notes", "Problem set 4"]),
+                tags=rng.sample(TAG_NAMES, rng.randint(0, 3)),
+            )
+        )
+    return SessionListResponse(items=items)
+
+
+def _weekly() -> WeeklySummaryResponse:
+    start = date(2026, 10, 12)
+    days = [
+        DailyPoint(
+            date=start + timedelta(days=i),
+            total_minutes=60 * i,
+            avg_focus=3.5 if i else None,
+            session_count=i,
+        )
+        for i in range(7)
+    ]
+    return WeeklySummaryResponse(start_date=start, end_date=days[-1].date, days=days)
+
+
+def payloads() -> dict[str, bytes]:
+    models = {
+        "weekly summary": _weekly(),
+        "heatmap 1y": _heatmap(1),
+        "heatmap 5y": _heatmap(5),
+        "sessions x50": _session_list(50),
+        "sessions x500": _session_list(500),
+    }
+    return {
+        name: JSONResponse(jsonable_encoder(model)).body for name, model in models.items()
+    }
+
+
+def _encode(factory, body: bytes, chunk_size: int | None) -> int:
+    encoder = factory()
+    if chunk_size is None:
+        return len(encoder.compress(body) + encoder.finish())
+    size = 0
+    for offset in range(0, len(body), chunk_size):
+        size += len(encoder.compress(body[offset : offset + chunk_size]))
+        size += len(encoder.flush())
+    return size + len(encoder.finish())
+
+
+def _cpu_us(factory, body: bytes, chunk_size: int | None, repeat: int) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        _encode(factory, body, chunk_size)
+    return (time.process_time() - started) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    encoders = available_encoders()
+    print(f"encodings: {', '.join(encoders)}")
+    print(
+        f"{'payload':<16}{'encoding':<10}{'bytes':>10}{'ratio':>8}"
+        f"{'cpu us':>10}{'streamed':>10}{'cpu us':>10}"
+    )
+    for name, body in payloads().items():
+        print(f"{name:<16}{'identity':<10}{len(body):>10}{1:>8.2f}")
+        for encoding, factory in encoders.items():
+            size = _encode(factory, body, None)
+            streamed = _encode(factory, body, STREAM_CHUNK_SIZE)
+            print(
+                f"{'':<16}{encoding:<10}{size:>10}{len(body) / size:>8.2f}"
+                f"{_cpu_us(factory, body, None, args.repeat):>10.0f}"
+                f"{streamed:>10}"
+                f"{_cpu_us(factory, body, STREAM_CHUNK_SIZE, args.repeat):>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
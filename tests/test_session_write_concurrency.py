@@ -0,0 +1,118 @@
+"""Parallel session writes keep per-user streaks exact."""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app.api.endpoints.sessions import _refresh_user_streaks
+from app.db.session import SessionLocal
+from app.models.user import User
+
+WORKERS = 12
+
+
+def _session_payload(day: date) -> dict:
+    return {
+        "start_time": f"{day}T08:00:00Z",
+        "end_time": f"{day}T09:00:00Z",
+        "focus_level": 3,
+        "tags": ["streak"],
+    }
+
+
+def _streaks(user_id: str) -> tuple[tuple, tuple]:
+    """Return (stored, recomputed) streak fields for the user."""
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        stored = (user.current_streak, user.longest_streak, user.last_study_date)
+        _refresh_user_streaks(db, user)
+        fresh = (user.current_streak, user.longest_streak, user.last_study_date)
+        db.rollback()
+    return stored, fresh
+
+
+def test_parallel_creates_and_deletes_keep_streaks_exact(client, make_user):
+    users = [make_user(), make_user()]
+    first_day = date(2026, 5, 1)
+    creates = [
+        (user_id, first_day + timedelta(days=i % 20))
+        for i in range(24)
+        for user_id in users
+    ]
+
+    def create(job: tuple[str, date]) -> tuple[str, int]:
+        user_id, day = job
+        response = client.post(
+            "/api/v1/sessions",
+            json=_session_payload(day),
+            headers={"X-User-Id": user_id},
+        )
+        assert response.status_code == 201, response.text
+        return user_id, response.json()["id"]
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        created = list(pool.map(create, creates))
+
+    # Delete a random subset, including a few duplicate deletes that race.
+    victims = random.Random(35).sample(created, 20)
+    victims += victims[:4]
+
+    def delete(job: tuple[str, int]) -> int:
+        user_id, session_id = job
+        response = client.delete(
+            f"/api/v1/sessions/{session_id}", headers={"X-User-Id": user_id}
+        )
+        assert response.status_code in (204, 404), response.text
+        return response.status_code
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        statuses = list(pool.map(delete, victims))
+
+    assert statuses.count(204) == 20
+    for user_id in users:
+        stored, fresh = _streaks(user_id)
+        assert stored == fresh
+
+
+def test_writes_for_other_users_do_not_wait_on_a_locked_user(
+    client, engine, make_user
+):
+    locked_user, other_user = make_user(), make_user()
+    blocked_status: list[int] = []
+
+    def write_locked_user() -> None:
+        response = client.post(
+            "/api/v1/sessions",
+            json=_session_payload(date(2026, 6, 1)),
+            headers={"X-User-Id": locked_user},
+        )
+        blocked_status.append(response.status_code)
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        conn.execute(select(User.id).where(User.id == locked_user).with_for_update())
+        blocked = threading.Thread(target=write_locked_user)
+        blocked.start()
+        time.sleep(0.3)
+        assert blocked.is_alive()
+
+        started = time.perf_counter()
+        response = client.post(
+            "/api/v1/sessions",
+            json=_session_payload(date(2026, 6, 1)),
+            headers={"X-User-Id": other_user},
+        )
+        assert response.status_code == 201
+        assert time.perf_counter() - started < 1.0
+        assert blocked.is_alive()
+        transaction.rollback()
+
+    blocked.join(timeout=10)
+    assert blocked_status == [201]
+    for user_id in (locked_user, other_user):
+        stored, fresh = _streaks(user_id)
+        assert stored == fresh
@@ -0,0 +1,70 @@
+"""Concurrent writers racing to create the same new tags."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+
+from app.api.endpoints.sessions import _get_or_create_tags
+from app.db.session import SessionLocal
+from app.models.tag import Tag
+
+THREADS = 12
+TAG_NAMES = [f"race-{i}" for i in range(20)]
+
+
+def _tag_rows(user_id: str) -> dict[str, int]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(Tag.name, func.count())
+            .where(Tag.user_id == user_id)
+            .group_by(Tag.name)
+        )
+        return dict(rows.all())
+
+
+def test_get_or_create_tags_races_without_errors(make_user):
+    user_id = make_user()
+    barrier = threading.Barrier(THREADS)
+
+    def resolve(_: int) -> dict[str, int]:
+        with SessionLocal() as db:
+            barrier.wait()
+            resolved = _get_or_create_tags(db, user_id, TAG_NAMES, 1)
+            db.commit()
+            return resolved
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(resolve, range(THREADS)))
+
+    assert all(result == results[0] for result in results)
+    assert sorted(results[0]) == sorted(TAG_NAMES)
+    assert _tag_rows(user_id) == {name: 1 for name in TAG_NAMES}
+
+
+def test_concurrent_session_creates_share_new_tags(client, make_user):
+    user_id = make_user()
+    barrier = threading.Barrier(THREADS)
+
+    def create(i: int) -> int:
+        barrier.wait()
+        response = client.post(
+            "/api/v1/sessions",
+            json={
+                "start_time": f"2026-03-{i + 1:02d}T09:00:00Z",
+                "end_time": f"2026-03-{i + 1:02d}T10:00:00Z",
+                "focus_level": 3,
+                "tags": ["fresh-a", "fresh-b"],
+            },
+            headers={"X-User-Id": user_id},
+        )
+        return response.status_code
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        statuses = list(pool.map(create, range(THREADS)))
+
+    assert statuses == [201] * THREADS
+    assert _tag_rows(user_id) == {"fresh-a": 1, "fresh-b": 1}
+    with SessionLocal() as db:
+        usage = db.execute(select(Tag.usage_count).where(Tag.user_id == user_id))
+        assert [count for (count,) in usage] == [THREADS, THREADS]